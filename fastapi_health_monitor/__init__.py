@@ -1,7 +1,42 @@
-from .healthmonitor import HealthMonitor
-from .models import HealthStatus, ComponentHealth
+from importlib import import_module
+from typing import TYPE_CHECKING
 
+from .constants import HealthStatus
 
-__all__ = ["HealthMonitor", "HealthStatus", "ComponentHealth"]
+if TYPE_CHECKING:
+    from .healthmonitor import HealthMonitor
+    from .models import ComponentHealth
+    from .instrumentation import Instrumentation, CheckHook, CheckTrace
+
+
+__all__ = [
+    "HealthMonitor",
+    "HealthStatus",
+    "ComponentHealth",
+    "Instrumentation",
+    "CheckHook",
+    "CheckTrace",
+]
 
 __version__ = "1.0.1"
+
+# Modules of exports which are imported on first use to keep package import fast
+_LAZY_EXPORTS = {
+    "HealthMonitor": ".healthmonitor",
+    "ComponentHealth": ".models",
+    "Instrumentation": ".instrumentation",
+    "CheckHook": ".instrumentation",
+    "CheckTrace": ".instrumentation",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
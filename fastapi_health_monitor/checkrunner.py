@@ -1,52 +1,282 @@
+import time
+import asyncio
+import inspect
 import logging
-from typing import Callable
-from datetime import datetime
+import threading
+import contextvars
+from contextlib import nullcontext
+from typing import Awaitable, Callable, List, Optional, Union
 
+from .settings import get_settings
 from .models import ComponentHealth
 from .constants import HealthStatus
+from .damping import StatusDamper
+from .concurrency import AdaptiveLimiter
+from .instrumentation import CheckTrace, Instrumentation
 
 
 logger = logging.getLogger(__name__)
 
+CheckFunction = Callable[
+    [ComponentHealth], Union[ComponentHealth, Awaitable[ComponentHealth]]
+]
+
+
+def _is_async_callable(obj: Callable) -> bool:
+    """
+    Returns whether calling the object returns an awaitable.
+    """
+    return inspect.iscoroutinefunction(obj) or inspect.iscoroutinefunction(
+        getattr(obj, "__call__", None)
+    )
+
 
 class CheckRunner:
     def __init__(
         self,
         component: ComponentHealth,
-        check_function: Callable[[ComponentHealth], ComponentHealth],
+        check_function: CheckFunction,
+        key: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        max_age_seconds: Optional[float] = None,
+        failure_threshold: Optional[int] = None,
+        success_threshold: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        depends_on: Optional[List[str]] = None,
     ) -> None:
         """
         A CheckRunner executes checks to determine the health status of a component.
 
         Args:
             component (ComponentHealth): component instance.
-            check_function (Callable): Check function.
+            check_function (Callable): Check function. Async functions are awaited and others run in a thread.
+            key (str): Optional unique key for the runner. Default: component_name:measurement_name
+            tags (list): Optional tags used to select runners.
+            max_age_seconds (float): Optional max age of results before they are stale. Default: settings
+            failure_threshold (int): Optional failures in a row before status changes to error. Default: settings
+            success_threshold (int): Optional successes in a row before status changes to ok. Default: settings
+            timeout_seconds (float): Optional check function timeout. Default: settings
+            depends_on (list): Optional keys of runners which must be ok for this check to run.
         """
         self.component: ComponentHealth = component
-        self.check_function: Callable[
-            [ComponentHealth], ComponentHealth
-        ] = check_function
+        self.check_function: CheckFunction = check_function
+        self.key: str = (
+            key or f"{component.component_name}:{component.measurement_name}"
+        )
+        self.tags: List[str] = tags or []
+        self.max_age_seconds: Optional[float] = max_age_seconds
+        self.failure_threshold: Optional[int] = failure_threshold
+        self.success_threshold: Optional[int] = success_threshold
+        self.timeout_seconds: Optional[float] = timeout_seconds
+        self.depends_on: List[str] = depends_on or []
+        self.damper = StatusDamper()
+        self.paused: bool = False
+        self._inflight: Optional[asyncio.Task] = None
 
-    async def run_check(self) -> ComponentHealth:
+    async def run_check(
+        self,
+        limiter: Optional[AdaptiveLimiter] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> ComponentHealth:
         """
         Run component check function and return response.
 
+        Callers running the check while it is in progress share the same execution.
+
+        Args:
+            limiter (AdaptiveLimiter): Optional limiter bounding concurrent executions.
+            instrumentation (Instrumentation): Optional hooks, tracing and profiling.
+
         Returns:
             ComponentHealth: component health response.
         """
-        component = self.component
-        # Run check
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.get_running_loop().create_task(
+                self._execute(limiter, instrumentation)
+            )
+
+        # Shield so a cancelled caller does not cancel the shared execution
+        return await asyncio.shield(self._inflight)
+
+    async def _execute(
+        self,
+        limiter: Optional[AdaptiveLimiter] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> ComponentHealth:
+        """
+        Execute component check function.
+
+        Args:
+            limiter (AdaptiveLimiter): Optional limiter bounding concurrent executions.
+            instrumentation (Instrumentation): Optional hooks, tracing and profiling.
+
+        Returns:
+            ComponentHealth: component health response.
+        """
+        timeout = (
+            self.timeout_seconds
+            if self.timeout_seconds is not None
+            else get_settings().health_check_timeout_seconds
+        )
+
+        # Pass a copy so a check that outlives its timeout cannot change the result
+        component = self.component.model_copy()
+
+        acquired = False
+        started = time.monotonic()
+        timed_out = False
+        thread: Optional[asyncio.Future] = None
         try:
-            # Update component by passing component to check function
-            component = self.check_function(component)
+            if limiter:
+                await limiter.acquire()
+                acquired = True
+
+            with instrumentation.check(
+                self.key
+            ) if instrumentation else nullcontext() as trace:
+                started = time.monotonic()
+
+                # Run check
+                try:
+                    # Update component by passing component to check function
+                    if _is_async_callable(self.check_function):
+                        call = self._call_async(component, trace)
+                    else:
+                        # Shield so the thread future resolves when the thread returns
+                        thread = self._submit_sync(component, trace)
+                        call = asyncio.shield(thread)
+                    component = await asyncio.wait_for(call, timeout)
+
+                # Component check timed out
+                except asyncio.TimeoutError:
+                    timed_out = True
+                    logger.warning(f"check timed out after {timeout:g}s: {self.key}")
+                    component = self.component.model_copy(
+                        update={
+                            "status": HealthStatus.ERROR,
+                            "output": f"Component health check function timed out after {timeout:g}s.",
+                        }
+                    )
+
+                # Component check failed
+                except Exception as e:  # pylint: disable=W0718
+                    logger.exception(e)
+                    component.status = HealthStatus.ERROR
+                    component.output = "Failed to run component health check function."
+
+                # Damp status changes
+                settings = get_settings()
+                component.status = self.damper.update(
+                    HealthStatus(component.status),
+                    failure_threshold=self.failure_threshold
+                    or settings.health_check_failure_threshold,
+                    success_threshold=self.success_threshold
+                    or settings.health_check_success_threshold,
+                )
 
-        # Component check failed
-        except Exception as e:  # pylint: disable=W0718
-            logger.exception(e)
-            component.status = HealthStatus.ERROR
-            component.output = "Failed to run component health check function."
+                # Update recorded time
+                component.mark_checked()
 
-        # Update recorded time
-        component.time = datetime.utcnow().isoformat()
+                if trace:
+                    trace.component = component
 
+        finally:
+            if acquired:
+                self._release(limiter, started, timed_out, thread)
+
+        self.component = component
         return component
+
+    @staticmethod
+    def _release(
+        limiter: AdaptiveLimiter,
+        started: float,
+        timed_out: bool,
+        thread: Optional[asyncio.Future],
+    ) -> None:
+        """
+        Release a limiter slot, waiting for a sync check thread which outlived its timeout.
+
+        Threads cannot be cancelled, so the slot is held until the thread returns to
+        keep the load on slow dependencies within the limit.
+        """
+
+        def release(future: Optional[asyncio.Future] = None) -> None:
+            # Retrieve result of abandoned thread so its errors are not reported
+            if future is not None and not future.cancelled():
+                future.exception()
+            limiter.release(time.monotonic() - started, timed_out=timed_out)
+
+        if thread is not None and not thread.done():
+            thread.add_done_callback(release)
+        else:
+            release()
+
+    def skip_check(self, failed_dependencies: List[str]) -> ComponentHealth:
+        """
+        Skip component check function because dependencies failed.
+
+        Args:
+            failed_dependencies (list): keys of failed dependency runners.
+
+        Returns:
+            ComponentHealth: component health response with inherited failure.
+        """
+        component = self.component.model_copy(
+            update={
+                "status": HealthStatus.ERROR,
+                "output": "Skipped as dependencies failed: "
+                + ", ".join(failed_dependencies),
+            }
+        )
+        component.mark_checked()
+
+        self.component = component
+        return component
+
+    async def _call_async(
+        self, component: ComponentHealth, trace: Optional[CheckTrace] = None
+    ) -> ComponentHealth:
+        """
+        Call async check function.
+
+        Args:
+            component (ComponentHealth): component instance.
+            trace (CheckTrace): Optional trace told what to profile.
+
+        Returns:
+            ComponentHealth: component health response.
+        """
+        coroutine = self.check_function(component)
+        if trace:
+            trace.coroutine = coroutine
+        return await coroutine
+
+    def _submit_sync(
+        self, component: ComponentHealth, trace: Optional[CheckTrace] = None
+    ) -> asyncio.Future:
+        """
+        Submit sync check function to the default executor.
+
+        Args:
+            component (ComponentHealth): component instance.
+            trace (CheckTrace): Optional trace told what to profile.
+
+        Returns:
+            Future: future resolved when the thread returns.
+        """
+        # Copy context so tracing spans are available in the thread
+        context = contextvars.copy_context()
+        return asyncio.get_running_loop().run_in_executor(
+            None, context.run, self._call_sync, component, trace
+        )
+
+    def _call_sync(
+        self, component: ComponentHealth, trace: Optional[CheckTrace] = None
+    ) -> ComponentHealth:
+        """
+        Call sync check function, recording the thread it runs on.
+        """
+        if trace:
+            trace.thread_ident = threading.get_ident()
+        return self.check_function(component)
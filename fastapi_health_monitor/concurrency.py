@@ -0,0 +1,121 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Deque
+
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        min_limit: int,
+        max_limit: int,
+        latency_target_seconds: float,
+        backoff_ratio: float = 0.5,
+    ) -> None:
+        """
+        An AdaptiveLimiter bounds concurrent check executions using AIMD.
+
+        The limit increases by one after a full limit of executions complete within
+        the latency target, and is multiplied by the backoff ratio when an execution
+        is slower than the target or times out. Decreases happen at most once per
+        latency target interval so a burst of slow checks only backs off once.
+
+        Args:
+            min_limit (int): Minimum concurrent executions.
+            max_limit (int): Maximum concurrent executions.
+            latency_target_seconds (float): Latency above which the limit is decreased.
+            backoff_ratio (float): Ratio applied to the limit on decrease. Default: 0.5
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target_seconds = latency_target_seconds
+        self.backoff_ratio = backoff_ratio
+        self.limit: int = max_limit
+        self.inflight: int = 0
+        self._successes: int = 0
+        self._last_decrease: float = float("-inf")
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        """
+        Wait for an execution slot.
+        """
+        if not self._waiters and self.inflight < self.limit:
+            self.inflight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was granted before cancellation so hand it back
+                self.inflight -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency_seconds: float, timed_out: bool = False) -> None:
+        """
+        Release an execution slot and adjust the limit.
+
+        Args:
+            latency_seconds (float): Execution latency.
+            timed_out (bool): Whether the execution timed out.
+        """
+        self.inflight -= 1
+        self._adjust(latency_seconds, timed_out)
+        self._wake()
+
+    def configure(
+        self, min_limit: int, max_limit: int, latency_target_seconds: float
+    ) -> None:
+        """
+        Change the limit bounds and latency target. Executions in flight keep their slots.
+
+        Args:
+            min_limit (int): Minimum concurrent executions.
+            max_limit (int): Maximum concurrent executions.
+            latency_target_seconds (float): Latency above which the limit is decreased.
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target_seconds = latency_target_seconds
+        self.limit = min(max(self.limit, min_limit), max_limit)
+        self._wake()
+
+    def _adjust(self, latency_seconds: float, timed_out: bool) -> None:
+        """
+        Adjust the limit based on an execution outcome.
+        """
+        if timed_out or latency_seconds > self.latency_target_seconds:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.latency_target_seconds:
+                self._last_decrease = now
+                self._successes = 0
+                limit = max(self.min_limit, int(self.limit * self.backoff_ratio))
+                if limit != self.limit:
+                    logger.info(f"decreased check concurrency limit to {limit}")
+                self.limit = limit
+            return
+
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.max_limit:
+            self._successes = 0
+            self.limit += 1
+
+    def _wake(self) -> None:
+        """
+        Grant slots to waiters while below the limit.
+        """
+        while self._waiters and self.inflight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.inflight += 1
+                waiter.set_result(None)
@@ -0,0 +1,84 @@
+from typing import Optional, Tuple
+
+from .constants import HealthStatus
+
+
+class StatusDamper:
+    def __init__(self) -> None:
+        """
+        A StatusDamper applies hysteresis to a stream of observed statuses.
+
+        The damped status only changes between healthy and unhealthy after the
+        opposite status has been observed a number of times in a row.
+        """
+        self.status: Optional[HealthStatus] = None
+        self.flap_count: int = 0
+        self._streak: int = 0
+
+    def update(
+        self,
+        status: HealthStatus,
+        failure_threshold: int = 1,
+        success_threshold: int = 1,
+    ) -> HealthStatus:
+        """
+        Observe a status and return the damped status.
+
+        Args:
+            status (HealthStatus): observed status.
+            failure_threshold (int): Failures in a row before changing from ok.
+            success_threshold (int): Successes in a row before changing to ok.
+
+        Returns:
+            HealthStatus: damped status.
+        """
+        status, self._streak, flapped = self._next(
+            status, failure_threshold, success_threshold
+        )
+        self.status = status
+        if flapped:
+            self.flap_count += 1
+        return status
+
+    def peek(
+        self,
+        status: HealthStatus,
+        failure_threshold: int = 1,
+        success_threshold: int = 1,
+    ) -> HealthStatus:
+        """
+        Return the damped status for an observation without recording it.
+
+        Args:
+            status (HealthStatus): observed status.
+            failure_threshold (int): Failures in a row before changing from ok.
+            success_threshold (int): Successes in a row before changing to ok.
+
+        Returns:
+            HealthStatus: damped status.
+        """
+        return self._next(status, failure_threshold, success_threshold)[0]
+
+    def _next(
+        self,
+        status: HealthStatus,
+        failure_threshold: int,
+        success_threshold: int,
+    ) -> Tuple[HealthStatus, int, bool]:
+        """
+        Returns the damped status, streak and whether the status flapped after an observation.
+        """
+        # First observation is adopted as there is no known state to hold
+        if self.status is None:
+            return status, 0, False
+
+        healthy = status == HealthStatus.OK
+        if healthy == (self.status == HealthStatus.OK):
+            # Same state observed, follow changes between unhealthy statuses
+            return status, 0, False
+
+        # Opposite state observed, change once the threshold is reached
+        streak = self._streak + 1
+        if streak >= (success_threshold if healthy else failure_threshold):
+            return status, 0, True
+        return self.status, streak, False
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple, Union
+
+import httpx
+from pydantic import ValidationError
+
+from .models import ComponentHealth, SystemHealth
+from .constants import HealthStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+def _status_entry(status: HealthStatus, output: Optional[str]) -> Dict[str, str]:
+    """
+    Returns a nested status entry with the output when there is one.
+    """
+    entry = {"status": HealthStatus(status).value}
+    if output:
+        entry["output"] = output
+    return entry
+
+
+class FederatedHealthCheck:
+    def __init__(
+        self,
+        targets: Union[Dict[str, str], List[str]],
+        timeout_seconds: float = 5.0,
+        max_concurrency: int = 10,
+        headers: Optional[Dict[str, str]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        """
+        A FederatedHealthCheck polls the health endpoints of downstream services.
+
+        Targets are polled concurrently over a pooled client and their statuses are
+        reported as nested entries of the component observed value. Responses are
+        cached by ETag so unchanged targets can answer with 304 Not Modified.
+
+        Args:
+            targets (dict): Health endpoint URLs by target name, or a list of URLs.
+            timeout_seconds (float): Timeout per target request. Default: 5.0
+            max_concurrency (int): Maximum targets polled at once. Default: 10
+            headers (dict): Optional headers sent with each request.
+            transport (AsyncBaseTransport): Optional httpx transport, for example for tests.
+        """
+        self.targets: Dict[str, str] = (
+            dict(targets) if isinstance(targets, dict) else {t: t for t in targets}
+        )
+        self.timeout_seconds = timeout_seconds
+        self.max_concurrency = max_concurrency
+        self.headers = headers or {}
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._cache: Dict[str, Tuple[str, SystemHealth]] = {}
+
+    async def __call__(self, component: ComponentHealth) -> ComponentHealth:
+        """
+        Poll all targets and update component with their statuses.
+
+        Args:
+            component (ComponentHealth): component instance.
+
+        Returns:
+            ComponentHealth: component health response.
+        """
+        if self._client is None:
+            self._loop = asyncio.get_running_loop()
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(max_connections=self.max_concurrency),
+                transport=self._transport,
+            )
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(
+            *(self._poll(semaphore, name, url) for name, url in self.targets.items())
+        )
+        observed = dict(zip(self.targets, results))
+
+        failed = [
+            name
+            for name, result in observed.items()
+            if result["status"] != HealthStatus.OK.value
+        ]
+        component.status = HealthStatus.ERROR if failed else HealthStatus.OK
+        component.output = f"Unhealthy targets: {', '.join(failed)}" if failed else None
+        component.observed_value = observed
+        return component
+
+    async def _poll(
+        self, semaphore: asyncio.Semaphore, name: str, url: str
+    ) -> Dict[str, Union[str, Dict[str, Dict[str, str]]]]:
+        """
+        Poll a target health endpoint.
+
+        Returns:
+            dict: target status and output with nested check statuses and outputs.
+        """
+        cached = self._cache.get(name)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+
+        async with semaphore:
+            try:
+                # Client timeouts apply per read so bound the whole request
+                res = await asyncio.wait_for(
+                    self._client.get(url, headers=headers), self.timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"federated health request timed out: {name}")
+                return {
+                    "status": HealthStatus.ERROR.value,
+                    "output": f"Request timed out after {self.timeout_seconds:g}s.",
+                }
+            except httpx.HTTPError as e:
+                logger.warning(f"federated health request failed: {name}: {e!r}")
+                self._cache.pop(name, None)
+                return {"status": HealthStatus.ERROR.value, "output": repr(e)}
+
+        if res.status_code == 304 and cached:
+            health = cached[1]
+        else:
+            try:
+                health = SystemHealth.model_validate_json(res.content)
+            except ValidationError:
+                self._cache.pop(name, None)
+                return {
+                    "status": HealthStatus.ERROR.value,
+                    "output": f"Unexpected response with status code {res.status_code}.",
+                }
+            etag = res.headers.get("ETag")
+            if etag:
+                self._cache[name] = (etag, health)
+
+        result = _status_entry(health.status, health.output)
+        result["checks"] = {
+            key: _status_entry(check.status, check.output)
+            for key, check in health.checks.items()
+        }
+        return result
+
+    def close(self) -> Optional[Future]:
+        """
+        Schedule the pooled client to be closed on the event loop it was created in.
+        Can be called from any thread.
+
+        Returns:
+            Future: future of the close, or None when there is no open client.
+        """
+        if self._client is None or self._loop is None or not self._loop.is_running():
+            return None
+        return asyncio.run_coroutine_threadsafe(self.aclose(), self._loop)
+
+    async def aclose(self) -> None:
+        """
+        Close the pooled client.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
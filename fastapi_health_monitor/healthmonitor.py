@@ -1,15 +1,32 @@
+import asyncio
 import logging
-from typing import Optional, List, Callable
-from fastapi import FastAPI, APIRouter, Response, status
+import secrets
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Optional, List, Dict, Set, Union
+from fastapi import (
+    Body,
+    FastAPI,
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from .constants import HealthStatus
-from .models import ComponentHealth, SystemHealth
+from .models import ComponentHealth, SystemHealth, ComponentRunnerState
 from .manager import HealthCheckManager
-from .checkrunner import CheckRunner
+from .checkrunner import CheckRunner, CheckFunction
+from .instrumentation import Instrumentation
+
+if TYPE_CHECKING:
+    from .federation import FederatedHealthCheck
 
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
 
 
 class HealthMonitor:
@@ -22,6 +39,9 @@ class HealthMonitor:
         description: Optional[str] = None,
         extra_notes: Optional[List[str]] = None,
         health_endpoint="/health",
+        admin_endpoint: Optional[str] = None,
+        admin_token: Optional[str] = None,
+        instrumentation: Optional[Instrumentation] = None,
     ) -> None:
         """
         A HealthMonitor which runs continuous background checks to determine API system health.
@@ -35,7 +55,13 @@ class HealthMonitor:
             description (str): Optional human-friendly description of the service.
             extra_notes (list): Optional notes relevant to the service health.
             health_endpoint (str): Health endpoint. Default: /health
+            admin_endpoint (str): Optional admin endpoint to manage components. Default: disabled
+            admin_token (str): Bearer token required by the admin endpoint.
+            instrumentation (Instrumentation): Optional hooks, tracing and profiling of checks.
         """
+        if admin_endpoint and not admin_token:
+            raise ValueError("admin_token is required when admin_endpoint is set")
+
         self._root_app = root_app
         self.service_id = service_id
         self.version = version
@@ -43,9 +69,15 @@ class HealthMonitor:
         self.description = description
         self.extra_notes = extra_notes or []
         self.health_endpoint = health_endpoint
+        self.admin_endpoint = admin_endpoint
+        self._admin_token = admin_token
+        self._federated_checks: Dict[str, "FederatedHealthCheck"] = {}
+        self._closing_federated_checks: Set[Future] = set()
 
         # Attach monitor to app
         self._attach_to_app(root_app=root_app)
+        if admin_endpoint:
+            self._attach_admin_to_app(root_app=root_app)
 
         # Create health check manager instance
         self._manager = HealthCheckManager(
@@ -54,6 +86,7 @@ class HealthMonitor:
             release_id=self.release_id,
             description=self.description,
             extra_notes=self.extra_notes,
+            instrumentation=instrumentation,
         )
 
     def _attach_to_app(
@@ -77,6 +110,14 @@ class HealthMonitor:
         async def shutdown_event() -> None:
             logger.info("service shutting down")
             self._manager.stop()
+            for check in self._federated_checks.values():
+                await check.aclose()
+            await asyncio.gather(
+                *(asyncio.wrap_future(f) for f in list(self._closing_federated_checks)),
+                return_exceptions=True,
+            )
+
+        router = APIRouter()
 
         @router.get(
             "",
@@ -92,6 +133,9 @@ class HealthMonitor:
                     "description": "The application is unhealthy.",
                     "model": SystemHealth,
                 },
+                304: {
+                    "description": "The health status matches the If-None-Match ETag.",
+                },
             },
         )
         @router.get(
@@ -99,13 +143,25 @@ class HealthMonitor:
             include_in_schema=False,
             response_model_exclude_none=True,
         )
-        async def _(response: Response) -> SystemHealth:
+        async def _(request: Request, response: Response) -> SystemHealth:
             """
             Returns current health status.
             """
             # Get response
             last_response = self._manager.get_response()
 
+            # Return not modified when client has the current status
+            etag = last_response.etag()
+            if_none_match = request.headers.get("If-None-Match")
+            if if_none_match and (
+                if_none_match.strip() == "*"
+                or etag in (tag.strip() for tag in if_none_match.split(","))
+            ):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+                )
+            response.headers["ETag"] = etag
+
             # Determine HTTP status code
             response.status_code = (
                 status.HTTP_200_OK
@@ -119,37 +175,359 @@ class HealthMonitor:
         # Add router into root app
         root_app.include_router(router, prefix=self.health_endpoint)
 
+    def _attach_admin_to_app(
+        self,
+        root_app: FastAPI,
+    ):
+        """
+        Attach the admin endpoint to the FastAPI root app.
+
+        Args:
+            root_app (FastAPI): FastAPI root app.
+        """
+        bearer = HTTPBearer(auto_error=False)
+
+        async def verify_token(
+            credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer),
+        ) -> None:
+            if credentials is None or not secrets.compare_digest(
+                credentials.credentials.encode(), self._admin_token.encode()
+            ):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid admin token.",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+
+        admin_router = APIRouter(dependencies=[Depends(verify_token)])
+
+        def get_runner(key: str) -> CheckRunner:
+            try:
+                return self._manager.get_check_runner(key)
+            except KeyError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Component not found: {key}",
+                ) from e
+
+        def get_runner_state(runner: CheckRunner) -> ComponentRunnerState:
+            check = self._manager.checks.get(runner.key)
+            return ComponentRunnerState(
+                key=runner.key,
+                component_name=runner.component.component_name,
+                measurement_name=runner.component.measurement_name,
+                paused=runner.paused,
+                status=check.status if check else HealthStatus.UNKNOWN,
+                flap_count=runner.damper.flap_count,
+                depends_on=runner.depends_on,
+            )
+
+        @admin_router.get(
+            "/components",
+            name="List health components",
+            response_model=List[ComponentRunnerState],
+        )
+        async def list_components() -> List[ComponentRunnerState]:
+            """
+            Returns registered components.
+            """
+            return [
+                get_runner_state(runner)
+                for runner in list(self._manager.runners.values())
+            ]
+
+        @admin_router.post(
+            "/components/{key}/pause",
+            name="Pause health component",
+            response_model=ComponentRunnerState,
+        )
+        async def pause_component(key: str) -> ComponentRunnerState:
+            """
+            Pause a component check.
+            """
+            runner = get_runner(key)
+            self.pause_component(key)
+            return get_runner_state(runner)
+
+        @admin_router.post(
+            "/components/{key}/resume",
+            name="Resume health component",
+            response_model=ComponentRunnerState,
+        )
+        async def resume_component(key: str) -> ComponentRunnerState:
+            """
+            Resume a paused component check.
+            """
+            runner = get_runner(key)
+            self.resume_component(key)
+            return get_runner_state(runner)
+
+        @admin_router.post(
+            "/components/{key}/run",
+            name="Run health component",
+            response_model=ComponentHealth,
+            response_model_exclude_none=True,
+        )
+        async def run_component(key: str) -> ComponentHealth:
+            """
+            Run a component check immediately and return its result.
+            """
+            get_runner(key)
+            return (await self.run_components(keys=[key]))[key]
+
+        @admin_router.post(
+            "/run",
+            name="Run health components",
+            response_model=Dict[str, ComponentHealth],
+            response_model_exclude_none=True,
+        )
+        async def run_components(
+            key: Optional[List[str]] = Query(default=None),
+            tag: Optional[List[str]] = Query(default=None),
+        ) -> Dict[str, ComponentHealth]:
+            """
+            Run component checks selected by key or tag immediately and return their results.
+            """
+            try:
+                return await self.run_components(keys=key, tags=tag)
+            except KeyError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Component not found: {e.args[0]}",
+                ) from e
+
+        @admin_router.get(
+            "/settings",
+            name="Get health settings",
+            response_model=Dict[str, Any],
+        )
+        async def current_settings() -> Dict[str, Any]:
+            """
+            Returns current settings.
+            """
+            return self._manager.current_settings()
+
+        @admin_router.patch(
+            "/settings",
+            name="Update health settings",
+            response_model=Dict[str, Any],
+        )
+        async def update_settings(values: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
+            """
+            Change settings. Changes apply to the next due checks.
+            """
+            try:
+                return self.reconfigure(**values)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=str(e),
+                ) from e
+
+        # Add admin router into root app
+        root_app.include_router(admin_router, prefix=self.admin_endpoint)
+
     def add_component(
         self,
         component_name: str,
         measurement_name: str,
-        check_function: Callable[[ComponentHealth], ComponentHealth],
+        check_function: CheckFunction,
         component_type: Optional[str] = None,
         observed_unit: Optional[str] = None,
         component_id: Optional[str] = None,
-    ):
+        key: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        max_age_seconds: Optional[float] = None,
+        failure_threshold: Optional[int] = None,
+        success_threshold: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        depends_on: Optional[List[str]] = None,
+    ) -> str:
         """
         Add component to health monitor checks.
 
+        A component added with the key of an existing component replaces it.
+
         Args:
             component_name (str): Human-readable name for the component.
             measurement_name (str): Name of the measurement type that the status is reported for.
-            check_function (callable): Check function which receives one APIHealthComponent argument and returns it.
+            check_function (callable): Check function which receives one APIHealthComponent argument and returns it. Can be async.
             component_type (str): Type of the component and could be one of: component, datastore, system.
             observed_unit (str): Clarifies the unit of measurement in which observed_unit is reported.
             component_id (str): Unique identifier of an instance of a specific sub-component/dependency of a service.
+            key (str): Unique key of the component in checks. Default: component_name:measurement_name
+            tags (list): Optional tags used to select components.
+            max_age_seconds (float): Optional max age of results before they are reported as stale.
+            failure_threshold (int): Optional failures in a row before the component changes to error.
+            success_threshold (int): Optional successes in a row before the component changes to ok.
+            timeout_seconds (float): Optional check function timeout.
+            depends_on (list): Optional keys of components which must be ok for this component to be checked.
+
+        Returns:
+            str: component key.
+
+        Raises:
+            ValueError: if the component dependencies create a cycle.
         """
+        runner = CheckRunner(
+            component=ComponentHealth(
+                component_name=component_name,
+                measurement_name=measurement_name,
+                component_id=component_id,
+                component_type=component_type,
+                observed_unit=observed_unit,
+            ),
+            check_function=check_function,
+            key=key,
+            tags=tags,
+            max_age_seconds=max_age_seconds,
+            failure_threshold=failure_threshold,
+            success_threshold=success_threshold,
+            timeout_seconds=timeout_seconds,
+            depends_on=depends_on,
+        )
+
         # Add component to service
-        self._manager.add_check_runner(
-            CheckRunner(
-                component=ComponentHealth(
-                    component_name=component_name,
-                    measurement_name=measurement_name,
-                    component_id=component_id,
-                    component_type=component_type,
-                    observed_unit=observed_unit,
-                ),
-                check_function=check_function,
-            )
+        self._manager.add_check_runner(runner)
+        self._discard_federated_check(runner.key)
+        logger.info(f"added check runner: {runner.key}")
+        return runner.key
+
+    def remove_component(self, key: str) -> None:
+        """
+        Remove component from health monitor checks.
+
+        Args:
+            key (str): component key.
+        """
+        self._manager.remove_check_runner(key)
+        self._discard_federated_check(key)
+
+    def pause_component(self, key: str) -> None:
+        """
+        Pause component checks. The last result is kept but ignored for system status.
+
+        Args:
+            key (str): component key.
+        """
+        self._manager.pause_check_runner(key)
+
+    def resume_component(self, key: str) -> None:
+        """
+        Resume paused component checks.
+
+        Args:
+            key (str): component key.
+        """
+        self._manager.resume_check_runner(key)
+
+    async def run_components(
+        self,
+        keys: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+    ) -> Dict[str, ComponentHealth]:
+        """
+        Run component checks immediately and return their fresh results.
+
+        Components are selected by key or tag, or all are run when neither are given.
+        Checks already in progress are shared instead of run twice.
+
+        Args:
+            keys (list): component keys.
+            tags (list): component tags.
+
+        Returns:
+            dict: component health results by key.
+        """
+        return await self._manager.run_check_runners(keys=keys, tags=tags)
+
+    def reconfigure(self, **values: Any) -> Dict[str, Any]:
+        """
+        Change settings at runtime, such as the check delay, timeout or concurrency limits.
+
+        Changes apply to the next due checks. Checks already running are not affected.
+
+        Args:
+            **values: settings to change, such as health_check_delay_seconds.
+
+        Returns:
+            dict: current settings.
+
+        Raises:
+            ValueError: if a setting is unknown or a value is invalid.
+        """
+        return self._manager.reconfigure(**values)
+
+    def reload_settings(self) -> Dict[str, Any]:
+        """
+        Reload settings from the environment and .env file.
+
+        Returns:
+            dict: current settings.
+
+        Raises:
+            ValueError: if a value is invalid.
+        """
+        return self._manager.reload_settings()
+
+    def add_federated_component(
+        self,
+        component_name: str,
+        targets: Union[Dict[str, str], List[str]],
+        measurement_name: str = "health",
+        target_timeout_seconds: float = 5.0,
+        max_concurrency: int = 10,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> str:
+        """
+        Add component which aggregates the health of downstream services.
+
+        Targets are health endpoints of services, such as those returned by another
+        HealthMonitor. Their statuses are reported as nested entries of the component
+        observed value and the component is ok when all targets are ok.
+
+        Args:
+            component_name (str): Human-readable name for the component.
+            targets (dict): Health endpoint URLs by target name, or a list of URLs.
+            measurement_name (str): Name of the measurement type. Default: health
+            target_timeout_seconds (float): Timeout per target request. Default: 5.0
+            max_concurrency (int): Maximum targets polled at once. Default: 10
+            headers (dict): Optional headers sent with each request.
+            **kwargs: Other add_component arguments.
+
+        Returns:
+            str: component key.
+        """
+        # Imported on first use as it is an optional subsystem
+        from .federation import (  # pylint: disable=C0415
+            FederatedHealthCheck,
+        )
+
+        check = FederatedHealthCheck(
+            targets=targets,
+            timeout_seconds=target_timeout_seconds,
+            max_concurrency=max_concurrency,
+            headers=headers,
+        )
+        key = self.add_component(
+            component_name=component_name,
+            measurement_name=measurement_name,
+            check_function=check,
+            **kwargs,
         )
-        logger.info(f"added check runner: {component_name}:{measurement_name}")
+        self._federated_checks[key] = check
+        return key
+
+    def _discard_federated_check(self, key: str) -> None:
+        """
+        Close the client of a federated check whose component was removed or replaced.
+
+        Args:
+            key (str): component key.
+        """
+        check = self._federated_checks.pop(key, None)
+        future = check.close() if check else None
+        if future is not None:
+            self._closing_federated_checks.add(future)
+            future.add_done_callback(self._closing_federated_checks.discard)
@@ -0,0 +1,259 @@
+import sys
+import time
+import logging
+import threading
+import traceback
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Iterator, List, Optional, Tuple
+
+from .models import ComponentHealth
+from .constants import HealthStatus
+
+
+logger = logging.getLogger(__name__)
+
+Stack = Tuple[str, ...]
+
+
+class CheckTrace:
+    def __init__(self, key: str) -> None:
+        """
+        A CheckTrace records the timings of a single check execution.
+
+        Args:
+            key (str): check runner key.
+        """
+        self.key: str = key
+        self.started: float = time.monotonic()
+        self.duration_seconds: Optional[float] = None
+        self.component: Optional[ComponentHealth] = None
+        self.samples: Counter = Counter()
+
+        # Set by the check runner so the profiler knows what to sample
+        self.thread_ident: Optional[int] = None
+        self.coroutine: Optional[Any] = None
+
+
+class CheckHook:
+    """
+    Base class for hooks called around check executions and check cycles.
+    Hooks run on the event loop so should return quickly.
+    """
+
+    def before_check(self, key: str) -> None:
+        """
+        Called before a check function is run.
+
+        Args:
+            key (str): check runner key.
+        """
+
+    def after_check(self, trace: CheckTrace) -> None:
+        """
+        Called after a check function has run.
+
+        Args:
+            trace (CheckTrace): check execution trace.
+        """
+
+    def before_cycle(self) -> None:
+        """
+        Called before a check cycle is run.
+        """
+
+    def after_cycle(self, duration_seconds: float) -> None:
+        """
+        Called after a check cycle has run.
+
+        Args:
+            duration_seconds (float): cycle duration.
+        """
+
+
+class NoopSpan:
+    """
+    Span which records nothing.
+    """
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """
+        Ignore span attribute.
+        """
+
+
+class NoopTracer:
+    """
+    Tracer with the OpenTelemetry start_as_current_span interface which records nothing.
+    """
+
+    def start_as_current_span(self, name: str, **kwargs) -> ContextManager[NoopSpan]:
+        """
+        Returns a context manager for a span which records nothing.
+        """
+        return nullcontext(NoopSpan())
+
+
+class SamplingProfiler:
+    def __init__(
+        self, threshold_seconds: float, interval_seconds: float = 0.01
+    ) -> None:
+        """
+        A SamplingProfiler records stacks of checks running longer than a threshold.
+
+        Args:
+            threshold_seconds (float): Duration after which a check is sampled.
+            interval_seconds (float): Interval between samples. Default: 0.01
+        """
+        self.threshold_seconds = threshold_seconds
+        self.interval_seconds = interval_seconds
+
+    @contextmanager
+    def profile(self, trace: CheckTrace) -> Iterator[None]:
+        """
+        Sample the check stack into the trace while the context is active.
+
+        Args:
+            trace (CheckTrace): check execution trace.
+        """
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample, args=(trace, stop), name="health-check-profiler"
+        )
+        sampler.daemon = True
+        sampler.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            sampler.join()
+
+    def _sample(self, trace: CheckTrace, stop: threading.Event) -> None:
+        """
+        Sample until stopped once the threshold has passed.
+        """
+        if stop.wait(self.threshold_seconds):
+            return
+        while True:
+            stack = self._stack(trace)
+            if stack:
+                trace.samples[stack] += 1
+            if stop.wait(self.interval_seconds):
+                return
+
+    @staticmethod
+    def _stack(trace: CheckTrace) -> Stack:
+        """
+        Returns the current stack of a check.
+        """
+        # Sync checks are sampled from the thread running them
+        if trace.thread_ident is not None:
+            frame = sys._current_frames().get(  # pylint: disable=W0212
+                trace.thread_ident
+            )
+            if frame is None:
+                return ()
+            return tuple(
+                f"{f.filename}:{f.lineno} in {f.name}"
+                for f in traceback.extract_stack(frame)
+            )
+
+        # Async checks are sampled by following the chain of awaited coroutines
+        frames: List[str] = []
+        coroutine = trace.coroutine
+        while coroutine is not None:
+            frame = getattr(coroutine, "cr_frame", None) or getattr(
+                coroutine, "gi_frame", None
+            )
+            if frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_filename}:{frame.f_lineno} in {code.co_name}")
+            coroutine = getattr(coroutine, "cr_await", None) or getattr(
+                coroutine, "gi_yieldfrom", None
+            )
+        return tuple(frames)
+
+
+class Instrumentation:
+    def __init__(
+        self,
+        hooks: Optional[List[CheckHook]] = None,
+        tracer: Optional[Any] = None,
+        profile_threshold_seconds: Optional[float] = None,
+        profile_interval_seconds: float = 0.01,
+    ) -> None:
+        """
+        Instrumentation runs hooks, tracing spans and profiling around checks.
+
+        Args:
+            hooks (list): Optional hooks called around checks and check cycles.
+            tracer (Tracer): Optional OpenTelemetry compatible tracer. Default: no-op tracer
+            profile_threshold_seconds (float): Optional duration after which slow checks are profiled. Default: disabled
+            profile_interval_seconds (float): Interval between profile samples. Default: 0.01
+        """
+        self.hooks: List[CheckHook] = hooks or []
+        self.tracer = tracer or NoopTracer()
+        self.profiler: Optional[SamplingProfiler] = (
+            SamplingProfiler(profile_threshold_seconds, profile_interval_seconds)
+            if profile_threshold_seconds is not None
+            else None
+        )
+
+    @contextmanager
+    def check(self, key: str) -> Iterator[CheckTrace]:
+        """
+        Instrument a check execution. The check runner sets the trace component.
+
+        Args:
+            key (str): check runner key.
+
+        Yields:
+            CheckTrace: check execution trace.
+        """
+        self._call_hooks("before_check", key)
+        with self.tracer.start_as_current_span(
+            "health_check", attributes={"health.check.key": key}
+        ) as span:
+            trace = CheckTrace(key)
+            try:
+                with self.profiler.profile(trace) if self.profiler else nullcontext():
+                    yield trace
+            finally:
+                trace.duration_seconds = time.monotonic() - trace.started
+                span.set_attribute(
+                    "health.check.duration_seconds", trace.duration_seconds
+                )
+                if trace.component is not None:
+                    span.set_attribute(
+                        "health.check.status",
+                        HealthStatus(trace.component.status).value,
+                    )
+        if trace.samples:
+            stack, count = trace.samples.most_common(1)[0]
+            logger.warning(
+                f"slow check {key} took {trace.duration_seconds:.3f}s, "
+                f"most sampled stack ({count}/{sum(trace.samples.values())} samples):\n"
+                + "\n".join(stack)
+            )
+        self._call_hooks("after_check", trace)
+
+    @contextmanager
+    def cycle(self) -> Iterator[None]:
+        """
+        Instrument a check cycle.
+        """
+        self._call_hooks("before_cycle")
+        started = time.monotonic()
+        with self.tracer.start_as_current_span("health_check_cycle"):
+            yield
+        self._call_hooks("after_cycle", time.monotonic() - started)
+
+    def _call_hooks(self, name: str, *args) -> None:
+        """
+        Call a method on all hooks, logging hook errors.
+        """
+        for hook in self.hooks:
+            try:
+                getattr(hook, name)(*args)
+            except Exception as e:  # pylint: disable=W0718
+                logger.exception(f"check hook error: {e}")
@@ -1,12 +1,19 @@
+import os
+import time
+import signal
 import asyncio
 import logging
-from typing import List, Dict, Optional
+from contextlib import nullcontext
+from typing import Any, Callable, List, Dict, Iterable, Optional, Union
 from datetime import datetime
 
-from .settings import settings
+from .settings import Settings, get_settings
 from .models import SystemHealth, ComponentHealth
 from .constants import HealthStatus
 from .checkrunner import CheckRunner
+from .damping import StatusDamper
+from .concurrency import AdaptiveLimiter
+from .instrumentation import Instrumentation
 
 
 logger = logging.getLogger(__name__)
@@ -20,6 +27,7 @@ class HealthCheckManager:
         release_id: str,
         description: Optional[str] = None,
         extra_notes: Optional[List[str]] = None,
+        instrumentation: Optional[Instrumentation] = None,
     ):
         """
         Manages and executes checks to determine the system health.
@@ -30,18 +38,34 @@ class HealthCheckManager:
             release_id (str): Implementation version of the service.
             description (str): Optional human-friendly description of the service.
             extra_notes (list): Optional notes relevant to the service health.
+            instrumentation (Instrumentation): Optional hooks, tracing and profiling of checks.
         """
         self.service_id = service_id
         self.version = version
         self.release_id = release_id
         self.description = description
         self.extra_notes = extra_notes = extra_notes or []
+        self.instrumentation = instrumentation
 
         self.status: HealthStatus = HealthStatus.UNKNOWN
         self.startup_timestamp: Optional[datetime] = None
+        self._startup_monotonic: Optional[float] = None
         self.last_checked_timestamp: Optional[datetime] = None
         self.checks: Dict[str, ComponentHealth] = {}
-        self.runners: List[CheckRunner] = []
+        self.runners: Dict[str, CheckRunner] = {}
+        self._waves: Optional[List[List[str]]] = None
+        self._first_cycle = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._watch_task: Optional[asyncio.Task] = None
+        self._signal_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._previous_sighup_handler: Optional[Union[Callable, int]] = None
+        self._damper = StatusDamper()
+        settings = get_settings()
+        self.limiter = AdaptiveLimiter(
+            min_limit=settings.health_check_concurrency_min,
+            max_limit=settings.health_check_concurrency_max,
+            latency_target_seconds=settings.health_check_latency_target_seconds,
+        )
 
     async def start(self) -> None:
         """
@@ -49,17 +73,35 @@ class HealthCheckManager:
         """
         logger.info("starting health check manager")
         self.startup_timestamp = datetime.utcnow()
+        self._startup_monotonic = time.monotonic()
         self.status = HealthStatus.STARTING_UP
 
         # Run continuous checks
         loop = asyncio.get_running_loop()
         loop.create_task(self._run())
 
+        # Reload settings on changes
+        self._start_watching_env_file()
+        if get_settings().health_settings_reload_on_sighup:
+            self._add_sighup_handler(loop)
+
+        # Optionally wait a bounded time for first results before serving requests
+        startup_wait = get_settings().health_check_startup_wait_seconds
+        if startup_wait:
+            try:
+                await asyncio.wait_for(self._first_cycle.wait(), startup_wait)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"first health checks did not finish within {startup_wait:g}s"
+                )
+
     def stop(self) -> None:
         """
         Stop the manager.
         """
         self.status = HealthStatus.SHUTTING_DOWN
+        self._wakeup.set()
+        self._remove_sighup_handler()
         logger.info("stopped health check manager")
 
     async def _run(self) -> None:
@@ -74,20 +116,233 @@ class HealthCheckManager:
                 break
             except Exception as e:  # pylint: disable=W0718
                 logger.exception(f"manager loop error: {e}")
+            finally:
+                self._first_cycle.set()
             # Wait for health check delay
-            await asyncio.sleep(settings.health_check_delay_seconds)
+            await self._wait_for_next_cycle(time.monotonic())
         logger.info("stopped health check refresh")
 
+    async def _wait_for_next_cycle(self, cycle_finished: float) -> None:
+        """
+        Wait for the health check delay after a cycle.
+
+        The delay is read again when settings change so a new delay applies to the
+        current wait.
+
+        Args:
+            cycle_finished (float): monotonic clock reading when the cycle finished.
+        """
+        while self.status != HealthStatus.SHUTTING_DOWN:
+            remaining = (
+                cycle_finished
+                + get_settings().health_check_delay_seconds
+                - time.monotonic()
+            )
+            if remaining <= 0:
+                # Always yield so a zero delay does not starve the event loop
+                await asyncio.sleep(0)
+                return
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+    def _start_watching_env_file(self) -> None:
+        """
+        Start watching the .env file if enabled and not already watched.
+        """
+        if not get_settings().health_settings_watch_seconds:
+            return
+        if self._watch_task is not None and not self._watch_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("watching settings file requires a running event loop")
+            return
+        self._watch_task = loop.create_task(self._watch_env_file())
+
+    async def _watch_env_file(self) -> None:
+        """
+        Reload settings when the .env file changes, until watching is disabled.
+        """
+        path = Settings.model_config.get("env_file")
+        last_modified = self._modified_time(path)
+        while self.status != HealthStatus.SHUTTING_DOWN:
+            interval = get_settings().health_settings_watch_seconds
+            if not interval:
+                break
+            await asyncio.sleep(interval)
+            modified = self._modified_time(path)
+            if modified != last_modified:
+                last_modified = modified
+                logger.info(f"settings file changed: {path}")
+                try:
+                    self.reload_settings()
+                except ValueError as e:
+                    logger.error(f"failed to reload settings: {e}")
+        logger.info("stopped watching settings file")
+
+    @staticmethod
+    def _modified_time(path: Optional[str]) -> Optional[int]:
+        """
+        Returns file modified time, or None if it does not exist.
+        """
+        try:
+            return os.stat(path).st_mtime_ns if path else None
+        except OSError:
+            return None
+
+    def _add_sighup_handler(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Reload settings when the process receives SIGHUP.
+
+        Args:
+            loop (AbstractEventLoop): running event loop.
+        """
+        try:
+            previous = signal.getsignal(signal.SIGHUP)
+            loop.add_signal_handler(signal.SIGHUP, self._reload_settings_on_signal)
+        except (AttributeError, NotImplementedError, RuntimeError, ValueError):
+            # Not available on Windows or outside the main thread
+            logger.warning("reloading settings on SIGHUP is not supported")
+            return
+        self._signal_loop = loop
+        self._previous_sighup_handler = previous
+
+    def _remove_sighup_handler(self) -> None:
+        """
+        Restore the SIGHUP handler which was installed before the manager started.
+        """
+        if self._signal_loop is None:
+            return
+        self._signal_loop.remove_signal_handler(signal.SIGHUP)
+        if self._previous_sighup_handler is not None:
+            signal.signal(signal.SIGHUP, self._previous_sighup_handler)
+        self._signal_loop = None
+        self._previous_sighup_handler = None
+
+    def _reload_settings_on_signal(self) -> None:
+        """
+        Reload settings from a signal handler, logging invalid settings.
+        """
+        logger.info("received SIGHUP")
+        try:
+            self.reload_settings()
+        except ValueError as e:
+            logger.error(f"failed to reload settings: {e}")
+
+    def reconfigure(self, **values: Any) -> Dict[str, Any]:
+        """
+        Change settings at runtime.
+
+        Changes apply to the next due checks. Checks already running are not affected.
+
+        Args:
+            **values: settings to change, such as health_check_delay_seconds.
+
+        Returns:
+            dict: current settings.
+
+        Raises:
+            ValueError: if a setting is unknown or a value is invalid.
+        """
+        unknown = set(values) - set(Settings.model_fields)
+        if unknown:
+            raise ValueError(f"unknown settings: {', '.join(sorted(unknown))}")
+
+        # Validate values together with the current settings
+        settings = get_settings()
+        validated = Settings(**{**self.current_settings(), **values})
+        for name in values:
+            setattr(settings, name, getattr(validated, name))
+        logger.info(f"reconfigured settings: {', '.join(sorted(values))}")
+
+        self._apply_settings()
+        return self.current_settings()
+
+    def reload_settings(self) -> Dict[str, Any]:
+        """
+        Reload settings from the environment and .env file.
+
+        Returns:
+            dict: current settings.
+
+        Raises:
+            ValueError: if a value is invalid.
+        """
+        settings = get_settings()
+        reloaded = Settings()
+        for name in Settings.model_fields:
+            setattr(settings, name, getattr(reloaded, name))
+        logger.info("reloaded settings")
+
+        self._apply_settings()
+        return self.current_settings()
+
+    @staticmethod
+    def current_settings() -> Dict[str, Any]:
+        """
+        Returns current values of declared settings.
+        """
+        settings = get_settings()
+        return {name: getattr(settings, name) for name in Settings.model_fields}
+
+    def _apply_settings(self) -> None:
+        """
+        Apply changed settings to the limiter, check loop and settings file watcher.
+        """
+        settings = get_settings()
+        self.limiter.configure(
+            min_limit=settings.health_check_concurrency_min,
+            max_limit=settings.health_check_concurrency_max,
+            latency_target_seconds=settings.health_check_latency_target_seconds,
+        )
+
+        # Wake the check loop so it uses the new delay
+        self._wakeup.set()
+
+        # Watch the settings file if it was enabled after start
+        started = self._startup_monotonic is not None
+        if started and self.status != HealthStatus.SHUTTING_DOWN:
+            self._start_watching_env_file()
+
     def get_response(self) -> SystemHealth:
         """
         Get current health check response.
 
+        Check results older than their max age are reported as stale.
+
         Returns:
             SystemHealth: health instance.
         """
+        now = time.monotonic()
+        system_status = self.status
+        checks: Dict[str, ComponentHealth] = {}
+        for key, check in self.checks.items():
+            runner = self.runners.get(key)
+            age = check.checked_age(now)
+            update = {
+                "time": check.checked_time() or check.time,
+                "age_seconds": round(age, 3) if age is not None else None,
+            }
+
+            # Downgrade stale results
+            max_age = self._max_age(runner)
+            if age is not None and age > max_age:
+                update["status"] = get_settings().health_check_stale_status
+                update[
+                    "output"
+                ] = f"Check result is stale: {age:.1f}s old exceeds max age of {max_age:g}s."
+                if system_status == HealthStatus.OK and not (runner and runner.paused):
+                    system_status = HealthStatus.ERROR
+
+            checks[key] = check.model_copy(update=update)
+
         return SystemHealth(
             service_id=self.service_id,
-            status=self.status,
+            status=system_status,
             version=self.version,
             release_id=self.release_id,
             description=self.description,
@@ -106,63 +361,361 @@ class HealthCheckManager:
                 ),
             ]
             + self.extra_notes,
-            checks=self.checks,
+            checks=checks,
         )
 
+    @staticmethod
+    def _max_age(runner: Optional[CheckRunner]) -> float:
+        """
+        Returns max age in seconds of a check result before it is stale.
+
+        Args:
+            runner (CheckRunner): check runner instance, or None for system checks.
+        """
+        if runner and runner.max_age_seconds is not None:
+            return runner.max_age_seconds
+        settings = get_settings()
+        if settings.health_check_max_age_seconds is not None:
+            return settings.health_check_max_age_seconds
+        return 3 * settings.health_check_delay_seconds
+
     async def _update_checks(self) -> None:
         """
         Update health checks.
         """
-        check_results: List[ComponentHealth] = []
-        # Loop all runners
-        for runner in self.runners:
-            # Run check and store response
-            response = await runner.run_check()
-            check_results.append(response)
+        with self.instrumentation.cycle() if self.instrumentation else nullcontext():
+            # Use a snapshot of runners so they can be changed during the cycle
+            waves = self._check_waves()
+            snapshot = dict(self.runners)
+
+            # Keep last result for paused runners
+            check_results: Dict[str, ComponentHealth] = {
+                key: self.checks[key]
+                for key, runner in snapshot.items()
+                if runner.paused and key in self.checks
+            }
+
+            # Run each wave of active checks concurrently after their dependencies
+            for wave in waves:
+                runners: List[CheckRunner] = []
+                for key in wave:
+                    runner = snapshot[key]
+                    if runner.paused:
+                        continue
+
+                    # Skip checks with failed dependencies
+                    failed = self._failed_dependencies(runner, check_results)
+                    if failed:
+                        check_results[key] = runner.skip_check(failed)
+                    else:
+                        runners.append(runner)
 
-        # Determine system status
-        self.status = (
+                check_results.update(await self._run_checks(runners))
+
+            # Update checks object with results of runners that are still registered
+            self.checks = {
+                key: c
+                for key, c in check_results.items()
+                if self.runners.get(key) is snapshot[key]
+            }
+
+            # Determine system status
+            self.status = self._aggregate_status()
+
+            # Update checks with system checks
+            self.checks.update(self._system_checks())
+
+            # Finish updating checks with recorded timestamp
+            self.last_checked_timestamp = datetime.utcnow()
+
+    def _failed_dependencies(
+        self, runner: CheckRunner, check_results: Dict[str, ComponentHealth]
+    ) -> List[str]:
+        """
+        Returns keys of runner dependencies whose latest result is not ok.
+        Paused and unregistered dependencies are ignored.
+
+        Args:
+            runner (CheckRunner): check runner instance.
+            check_results (dict): results of the current cycle.
+        """
+        failed = []
+        for dependency in runner.depends_on:
+            dependency_runner = self.runners.get(dependency)
+            if dependency_runner is None or dependency_runner.paused:
+                continue
+            result = check_results.get(dependency, self.checks.get(dependency))
+            if result is not None and HealthStatus(result.status) != HealthStatus.OK:
+                failed.append(dependency)
+        return failed
+
+    def _raw_status(self) -> HealthStatus:
+        """
+        Determine undamped system status from the checks of active runners.
+
+        Returns:
+            HealthStatus: system status.
+        """
+        return (
             HealthStatus.ERROR
-            if any(HealthStatus(c.status) != HealthStatus.OK for c in check_results)
+            if any(
+                HealthStatus(c.status) != HealthStatus.OK
+                for key, c in self.checks.items()
+                if key in self.runners and not self.runners[key].paused
+            )
             else HealthStatus.OK
         )
 
-        # Update checks object with component checks
-        self.checks = {
-            f"{c.component_name}:{c.measurement_name}": c for c in check_results
-        }
+    def _aggregate_status(self, observe: bool = True) -> HealthStatus:
+        """
+        Determine damped system status from the checks of active runners.
 
-        # Update checks with system checks
-        self.checks.update(self._system_checks())
+        Args:
+            observe (bool): Record the status as an observation of the damper.
+                Only check cycles are observations so forced runs do not count
+                towards the thresholds. Default: True
 
-        # Finish updating checks with recorded timestamp
-        self.last_checked_timestamp = datetime.utcnow()
+        Returns:
+            HealthStatus: system status.
+        """
+        settings = get_settings()
+        damp = self._damper.update if observe else self._damper.peek
+        return damp(
+            self._raw_status(),
+            failure_threshold=settings.health_status_failure_threshold,
+            success_threshold=settings.health_status_success_threshold,
+        )
 
     def _system_checks(self) -> Dict[str, ComponentHealth]:
         """
         Returns system checks.
         """
+        uptime = ComponentHealth(
+            component_type="system",
+            measurement_name="uptime",
+            status=HealthStatus.OK,
+            observed_unit="s",
+            observed_value=time.monotonic() - self._startup_monotonic
+            if self._startup_monotonic is not None
+            else None,
+        )
+        status_flaps = ComponentHealth(
+            component_type="system",
+            measurement_name="status_flaps",
+            status=HealthStatus.OK,
+            observed_value=self._damper.flap_count,
+        )
+        concurrency_limit = ComponentHealth(
+            component_type="system",
+            measurement_name="concurrency_limit",
+            status=HealthStatus.OK,
+            observed_value=self.limiter.limit,
+        )
+        for check in (uptime, status_flaps, concurrency_limit):
+            check.mark_checked()
         return {
-            "uptime": ComponentHealth(
-                component_type="system",
-                measurement_name="uptime",
-                status=HealthStatus.OK,
-                observed_unit="s",
-                observed_value=(
-                    datetime.utcnow() - self.startup_timestamp
-                ).total_seconds()
-                if self.startup_timestamp
-                else None,
-                time=datetime.utcnow().isoformat(),
-            )
+            "uptime": uptime,
+            "status_flaps": status_flaps,
+            "concurrency_limit": concurrency_limit,
         }
 
+    def _check_waves(self) -> List[List[str]]:
+        """
+        Returns runner keys grouped in waves where each wave only depends on earlier waves.
+        Dependencies which are not registered are ignored.
+        """
+        if self._waves is None:
+            remaining = {
+                key: {dep for dep in runner.depends_on if dep in self.runners}
+                for key, runner in self.runners.items()
+            }
+            waves: List[List[str]] = []
+            while remaining:
+                wave = [key for key, deps in remaining.items() if not deps]
+                if not wave:
+                    raise ValueError(
+                        f"dependency cycle between: {', '.join(remaining)}"
+                    )
+                for key in wave:
+                    del remaining[key]
+                for deps in remaining.values():
+                    deps.difference_update(wave)
+                waves.append(wave)
+            self._waves = waves
+        return self._waves
+
+    def _creates_cycle(self, runner: CheckRunner) -> bool:
+        """
+        Returns whether registering the runner would create a dependency cycle.
+        """
+        pending = list(runner.depends_on)
+        visited = set()
+        while pending:
+            key = pending.pop()
+            if key == runner.key:
+                return True
+            if key in visited or key not in self.runners:
+                continue
+            visited.add(key)
+            pending.extend(self.runners[key].depends_on)
+        return False
+
     def add_check_runner(self, runner: CheckRunner) -> None:
         """
         Add runner to run component health checks.
 
+        A runner registered with the same key is replaced.
+
         Args:
             runner (CheckRunner): check runner instance.
+
+        Raises:
+            ValueError: if the runner dependencies create a cycle.
+        """
+        if self._creates_cycle(runner):
+            raise ValueError(f"check runner dependencies create a cycle: {runner.key}")
+        if runner.key in self.runners:
+            logger.info(f"replacing check runner: {runner.key}")
+        self.runners[runner.key] = runner
+        self._waves = None
+
+    def remove_check_runner(self, key: str) -> CheckRunner:
+        """
+        Remove runner and its last check result.
+
+        Args:
+            key (str): check runner key.
+
+        Returns:
+            CheckRunner: removed check runner instance.
+
+        Raises:
+            KeyError: if no runner is registered with the key.
+        """
+        runner = self.runners.pop(key)
+        self.checks.pop(key, None)
+        self._waves = None
+        logger.info(f"removed check runner: {key}")
+        return runner
+
+    def get_check_runner(self, key: str) -> CheckRunner:
+        """
+        Get runner by key.
+
+        Args:
+            key (str): check runner key.
+
+        Returns:
+            CheckRunner: check runner instance.
+
+        Raises:
+            KeyError: if no runner is registered with the key.
+        """
+        return self.runners[key]
+
+    def pause_check_runner(self, key: str) -> None:
         """
-        if runner not in self.runners:
-            self.runners.append(runner)
+        Pause runner so it is skipped by the check loop.
+
+        Args:
+            key (str): check runner key.
+        """
+        self.runners[key].paused = True
+        logger.info(f"paused check runner: {key}")
+
+    def resume_check_runner(self, key: str) -> None:
+        """
+        Resume a paused runner.
+
+        Args:
+            key (str): check runner key.
+        """
+        self.runners[key].paused = False
+        logger.info(f"resumed check runner: {key}")
+
+    def select_check_runners(
+        self,
+        keys: Optional[Iterable[str]] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> List[CheckRunner]:
+        """
+        Select runners by key or tag. All runners are selected when neither are given.
+
+        Args:
+            keys (list): check runner keys.
+            tags (list): check runner tags.
+
+        Returns:
+            list: selected check runner instances.
+
+        Raises:
+            KeyError: if no runner is registered with one of the keys.
+        """
+        if keys is None and tags is None:
+            return list(self.runners.values())
+
+        selected = {key: self.runners[key] for key in keys or []}
+        tags = set(tags or [])
+        if tags:
+            selected.update(
+                (key, runner)
+                for key, runner in self.runners.items()
+                if tags.intersection(runner.tags)
+            )
+        return list(selected.values())
+
+    async def run_check_runners(
+        self,
+        keys: Optional[Iterable[str]] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Dict[str, ComponentHealth]:
+        """
+        Run checks immediately and update their results.
+
+        Dependencies are not considered so selected checks always run.
+        Checks already running, for example by the check loop, are shared and not run twice.
+
+        Args:
+            keys (list): check runner keys.
+            tags (list): check runner tags.
+
+        Returns:
+            dict: component health responses by key.
+
+        Raises:
+            KeyError: if no runner is registered with one of the keys.
+        """
+        runners = self.select_check_runners(keys, tags)
+        responses = await self._run_checks(runners)
+
+        # Only store results of runners that were not changed while running
+        self.checks.update(
+            (runner.key, responses[runner.key])
+            for runner in runners
+            if self.runners.get(runner.key) is runner
+        )
+        if self.status not in (HealthStatus.STARTING_UP, HealthStatus.SHUTTING_DOWN):
+            self.status = self._aggregate_status(observe=False)
+
+        return responses
+
+    async def _run_checks(
+        self, runners: Iterable[CheckRunner]
+    ) -> Dict[str, ComponentHealth]:
+        """
+        Run checks concurrently within the adaptive concurrency limit.
+
+        Args:
+            runners (list): check runner instances.
+
+        Returns:
+            dict: component health responses by key.
+        """
+        runners = list(runners)
+        responses = await asyncio.gather(
+            *(
+                runner.run_check(self.limiter, self.instrumentation)
+                for runner in runners
+            )
+        )
+        return {runner.key: response for runner, response in zip(runners, responses)}
@@ -1,5 +1,8 @@
+import time
+import hashlib
+from datetime import datetime
 from typing import Optional, List, Dict, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from .constants import HealthStatus, ComponentType
 
@@ -43,6 +46,40 @@ class ComponentHealth(BaseModel):
     output: Optional[str] = Field(
         default=None, title='Raw error output, in case of "fail" or "warn" states.'
     )
+    age_seconds: Optional[float] = Field(
+        default=None,
+        title="Number of seconds since the reading of the observedValue was recorded.",
+    )
+
+    # Clock readings of the last check, formatted only when a response is returned
+    _checked_monotonic: Optional[float] = PrivateAttr(default=None)
+    _checked_timestamp: Optional[float] = PrivateAttr(default=None)
+
+    def mark_checked(self) -> None:
+        """
+        Record the time at which the component was checked.
+        """
+        self._checked_monotonic = time.monotonic()
+        self._checked_timestamp = time.time()
+
+    def checked_age(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Returns seconds since the component was checked.
+
+        Args:
+            now (float): Optional monotonic clock reading. Default: current reading.
+        """
+        if self._checked_monotonic is None:
+            return None
+        return (time.monotonic() if now is None else now) - self._checked_monotonic
+
+    def checked_time(self) -> Optional[str]:
+        """
+        Returns the ISO8601 date-time at which the component was checked.
+        """
+        if self._checked_timestamp is None:
+            return None
+        return datetime.utcfromtimestamp(self._checked_timestamp).isoformat()
 
 
 class SystemHealth(BaseModel):
@@ -83,3 +120,50 @@ class SystemHealth(BaseModel):
             "and endpoints which can affect the overall health of the main API."
         ),
     )
+
+    def etag(self) -> str:
+        """
+        Returns a weak ETag of the statuses and outputs of the system and its checks.
+
+        Reading times and observed values change every cycle and are not included,
+        so the ETag only changes when the health of the system changes.
+        """
+        body = self.model_dump_json(
+            exclude_none=True,
+            include={
+                "status": True,
+                "output": True,
+                "checks": {"__all__": {"status", "output"}},
+            },
+        )
+        return f'W/"{hashlib.blake2b(body.encode(), digest_size=16).hexdigest()}"'
+
+
+class ComponentRunnerState(BaseModel):
+    """
+    Represents the state of a registered component check runner.
+    """
+
+    key: str = Field(title="Unique key of the component check runner.")
+    component_name: Optional[str] = Field(
+        default=None, title="Human-readable name for the component."
+    )
+    measurement_name: Optional[str] = Field(
+        default=None,
+        title="Name of the measurement type that the status is reported for.",
+    )
+    paused: bool = Field(
+        default=False, title="Indicates whether the component check is paused."
+    )
+    status: HealthStatus = Field(
+        default=HealthStatus.UNKNOWN,
+        title="Status reported by the last component check.",
+    )
+    flap_count: int = Field(
+        default=0,
+        title="Number of times the component status changed between ok and not ok.",
+    )
+    depends_on: List[str] = Field(
+        default_factory=list,
+        title="Keys of components which must be ok for the component to be checked.",
+    )
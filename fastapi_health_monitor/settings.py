@@ -1,5 +1,9 @@
+from functools import lru_cache
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .constants import HealthStatus
+
 
 class Settings(BaseSettings):
     """
@@ -8,10 +12,53 @@ class Settings(BaseSettings):
 
     health_check_delay_seconds: int = 10
 
+    # Max time app startup waits for the first checks to finish. Default: no wait
+    health_check_startup_wait_seconds: Optional[float] = None
+
+    # Max age of check results before they are stale. Default: 3 * delay
+    health_check_max_age_seconds: Optional[float] = None
+
+    # Status reported for stale check results
+    health_check_stale_status: HealthStatus = HealthStatus.UNKNOWN
+
+    # Component results in a row before a component changes to error / ok
+    health_check_failure_threshold: int = 1
+    health_check_success_threshold: int = 1
+
+    # Check function timeout. Default: no timeout
+    health_check_timeout_seconds: Optional[float] = None
+
+    # Bounds of the adaptive concurrent check limit and the latency which lowers it
+    health_check_concurrency_min: int = 1
+    health_check_concurrency_max: int = 32
+    health_check_latency_target_seconds: float = 1.0
+
+    # System results in a row before the system changes to error / ok
+    health_status_failure_threshold: int = 1
+    health_status_success_threshold: int = 1
+
+    # Interval to check the .env file for changes to reload. Default: disabled
+    health_settings_watch_seconds: Optional[float] = None
+
+    # Reload settings when the process receives SIGHUP
+    health_settings_reload_on_sighup: bool = False
+
     # Read settings from .env file if one exists
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="allow"
     )
 
 
-settings = Settings()
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Returns the shared settings instance, reading them on first use.
+    """
+    return Settings()
+
+
+def __getattr__(name: str):
+    # Keep module level settings instance available without reading it on import
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
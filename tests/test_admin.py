@@ -0,0 +1,162 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fastapi_health_monitor import HealthMonitor, HealthStatus
+from fastapi_health_monitor.settings import settings
+
+
+def fake_ok_check(component):
+    component.status = HealthStatus.OK
+    return component
+
+
+def fake_error_check(component):
+    component.status = HealthStatus.ERROR
+    return component
+
+
+def create_monitor(app):
+    settings.health_check_startup_wait_seconds = 5
+    return HealthMonitor(
+        root_app=app,
+        service_id="foobar",
+        version="1",
+        release_id="1.0.0",
+        admin_endpoint="/admin",
+        admin_token="secret",
+    )
+
+
+def test_that_admin_endpoint_requires_token():
+    # GIVEN FastAPI app
+    app = FastAPI(debug=True)
+
+    # GIVEN health monitor instance with admin endpoint
+    create_monitor(app)
+
+    # WHEN listing components without and with an invalid token
+    with TestClient(app) as client:
+        res_missing = client.get("/admin/components")
+        res_invalid = client.get(
+            "/admin/components", headers={"Authorization": "Bearer wrong"}
+        )
+
+    # THEN expect unauthorized
+    assert res_missing.status_code == 401
+    assert res_invalid.status_code == 401
+
+
+def test_that_admin_endpoint_requires_token_to_be_configured():
+    # GIVEN FastAPI app
+    app = FastAPI(debug=True)
+
+    # WHEN creating health monitor with admin endpoint but no token
+    # THEN expect error
+    with pytest.raises(ValueError):
+        HealthMonitor(
+            root_app=app,
+            service_id="foobar",
+            version="1",
+            release_id="1.0.0",
+            admin_endpoint="/admin",
+        )
+
+
+def test_that_admin_endpoint_lists_pauses_and_runs_components():
+    # GIVEN FastAPI app
+    app = FastAPI(debug=True)
+
+    # GIVEN health monitor instance with admin endpoint
+    monitor = create_monitor(app)
+
+    # GIVEN registered components
+    monitor.add_component(
+        component_name="fake_component",
+        measurement_name="foobar",
+        check_function=fake_ok_check,
+    )
+    monitor.add_component(
+        component_name="broken_component",
+        measurement_name="foobar",
+        check_function=fake_error_check,
+    )
+    headers = {"Authorization": "Bearer secret"}
+
+    with TestClient(app) as client:
+        # WHEN listing components
+        res = client.get("/admin/components", headers=headers)
+
+        # THEN expect both components
+        assert res.status_code == 200
+        assert [c["key"] for c in res.json()] == [
+            "fake_component:foobar",
+            "broken_component:foobar",
+        ]
+        assert res.json()[1]["status"] == "error"
+
+        # THEN expect system to be unhealthy
+        assert client.get("/health").status_code == 503
+
+        # WHEN pausing the broken component
+        res = client.post(
+            "/admin/components/broken_component:foobar/pause", headers=headers
+        )
+
+        # THEN expect component to be paused
+        assert res.status_code == 200
+        assert res.json()["paused"] is True
+
+        # WHEN forcing a run of the healthy component
+        res = client.post(
+            "/admin/components/fake_component:foobar/run", headers=headers
+        )
+
+        # THEN expect fresh result
+        assert res.status_code == 200
+        assert res.json()["status"] == "ok"
+
+        # THEN expect paused component to be ignored for system status
+        assert client.get("/health").status_code == 200
+
+        # WHEN running an unknown component
+        res = client.post("/admin/components/unknown/run", headers=headers)
+
+        # THEN expect not found
+        assert res.status_code == 404
+
+
+def test_that_admin_endpoint_runs_components_by_tag():
+    # GIVEN FastAPI app
+    app = FastAPI(debug=True)
+
+    # GIVEN health monitor instance with admin endpoint
+    monitor = create_monitor(app)
+
+    # GIVEN registered components with tags
+    monitor.add_component(
+        component_name="db",
+        measurement_name="ping",
+        check_function=fake_ok_check,
+        tags=["datastore"],
+    )
+    monitor.add_component(
+        component_name="api",
+        measurement_name="reachability",
+        check_function=fake_ok_check,
+    )
+    headers = {"Authorization": "Bearer secret"}
+
+    with TestClient(app) as client:
+        # WHEN running components by tag
+        res = client.post("/admin/run", params={"tag": "datastore"}, headers=headers)
+
+        # THEN expect only tagged component results
+        assert res.status_code == 200
+        assert list(res.json()) == ["db:ping"]
+
+        # WHEN running an unknown component by key
+        res = client.post("/admin/run", params={"key": "unknown"}, headers=headers)
+
+        # THEN expect not found
+        assert res.status_code == 404
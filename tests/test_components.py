@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -14,6 +16,9 @@ def test_that_health_monitor_component_is_registered(component_status):
     # GIVEN health check interval
     settings.health_check_delay_seconds = 1
 
+    # GIVEN startup waits for first checks
+    settings.health_check_startup_wait_seconds = 5
+
     # GIVEN component check function
     def fake_component_check(component):
         component.status = component_status
@@ -62,6 +67,9 @@ def test_that_health_monitor_unhealthy_component_returns_error_status(component_
     # GIVEN health check interval
     settings.health_check_delay_seconds = 1
 
+    # GIVEN startup waits for first checks
+    settings.health_check_startup_wait_seconds = 5
+
     # GIVEN component check function
     def fake_component_check(component):
         component.status = component_status
@@ -107,6 +115,9 @@ def test_that_health_monitor_component_error_returns_error_status(caplog):
     # GIVEN health check interval
     settings.health_check_delay_seconds = 1
 
+    # GIVEN startup waits for first checks
+    settings.health_check_startup_wait_seconds = 5
+
     # GIVEN component check function that raises error
     def fake_component_check(component):
         raise RuntimeError("forced error")
@@ -154,3 +165,35 @@ def test_that_health_monitor_component_error_returns_error_status(caplog):
 
     # THEN expect component error detail in logs
     assert "RuntimeError: forced error" in caplog.text
+
+
+def test_that_health_monitor_is_starting_up_while_first_checks_run():
+    # GIVEN FastAPI app
+    app = FastAPI(debug=True)
+
+    # GIVEN component check function that hangs
+    async def hanging_component_check(component):
+        await asyncio.Event().wait()
+
+    # GIVEN health monitor instance
+    monitor = HealthMonitor(
+        root_app=app,
+        service_id="foobar",
+        version="1",
+        release_id="1.0.0",
+    )
+
+    # GIVEN registered component
+    monitor.add_component(
+        component_name="fake_component",
+        measurement_name="foobar",
+        check_function=hanging_component_check,
+    )
+
+    # WHEN fetching health status
+    with TestClient(app) as client:
+        res = client.get("/health")
+
+    # THEN expect starting up while the first checks are running
+    assert res.status_code == 503
+    assert res.json()["status"] == "starting_up"
@@ -0,0 +1,95 @@
+import time
+import asyncio
+
+from fastapi_health_monitor import ComponentHealth, HealthStatus
+from fastapi_health_monitor.checkrunner import CheckRunner
+from fastapi_health_monitor.concurrency import AdaptiveLimiter
+
+
+def test_that_limiter_backs_off_on_slow_executions_and_recovers():
+    # GIVEN limiter instance
+    limiter = AdaptiveLimiter(min_limit=1, max_limit=8, latency_target_seconds=0.5)
+
+    async def run():
+        # WHEN an execution is slower than the target
+        await limiter.acquire()
+        limiter.release(latency_seconds=1.0)
+
+        # THEN expect limit to be halved
+        assert limiter.limit == 4
+
+        # WHEN another slow execution completes in the same interval
+        await limiter.acquire()
+        limiter.release(latency_seconds=1.0, timed_out=True)
+
+        # THEN expect no further decrease
+        assert limiter.limit == 4
+
+        # WHEN a full limit of fast executions complete
+        for _ in range(4):
+            await limiter.acquire()
+            limiter.release(latency_seconds=0.1)
+
+        # THEN expect limit to increase by one
+        assert limiter.limit == 5
+
+    asyncio.run(run())
+
+
+def test_that_limiter_bounds_concurrent_executions():
+    # GIVEN limiter instance with a limit of 2
+    limiter = AdaptiveLimiter(min_limit=1, max_limit=2, latency_target_seconds=1.0)
+    running = []
+    peak = []
+
+    async def execute():
+        await limiter.acquire()
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+        limiter.release(latency_seconds=0.01)
+
+    # WHEN running more executions than the limit
+    async def run():
+        await asyncio.gather(*(execute() for _ in range(6)))
+
+    asyncio.run(run())
+
+    # THEN expect concurrency to stay within the limit
+    assert max(peak) == 2
+    assert limiter.inflight == 0
+
+
+def test_that_timed_out_sync_checks_hold_slot_until_thread_returns():
+    # GIVEN limiter instance
+    limiter = AdaptiveLimiter(min_limit=1, max_limit=8, latency_target_seconds=1.0)
+
+    # GIVEN blocking sync check which outlives its timeout
+    def blocking_check(component):
+        time.sleep(0.1)
+        return component
+
+    runner = CheckRunner(
+        component=ComponentHealth(component_name="db", measurement_name="ping"),
+        check_function=blocking_check,
+        timeout_seconds=0.01,
+    )
+
+    async def run():
+        # WHEN the check times out
+        result = await runner.run_check(limiter)
+        inflight_after_timeout = limiter.inflight
+
+        # WHEN the thread returns
+        await asyncio.sleep(0.2)
+        return result, inflight_after_timeout
+
+    result, inflight_after_timeout = asyncio.run(run())
+
+    # THEN expect timeout result
+    assert result.status == HealthStatus.ERROR
+
+    # THEN expect slot to be held until the thread returned
+    assert inflight_after_timeout == 1
+    assert limiter.inflight == 0
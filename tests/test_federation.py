@@ -0,0 +1,181 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fastapi_health_monitor import ComponentHealth, HealthMonitor, HealthStatus
+from fastapi_health_monitor.federation import FederatedHealthCheck
+from fastapi_health_monitor.settings import settings
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport):
+        self.transport = transport
+        self.status_codes = []
+
+    async def handle_async_request(self, request):
+        response = await self.transport.handle_async_request(request)
+        self.status_codes.append(response.status_code)
+        return response
+
+
+def create_stub_services():
+    # Stub services are health monitors served by one app under different prefixes
+    app = FastAPI()
+    healthy = HealthMonitor(
+        root_app=app,
+        service_id="healthy",
+        version="1",
+        release_id="1.0.0",
+        health_endpoint="/healthy/health",
+    )
+    unhealthy = HealthMonitor(
+        root_app=app,
+        service_id="unhealthy",
+        version="1",
+        release_id="1.0.0",
+        health_endpoint="/unhealthy/health",
+    )
+
+    def error_check(component):
+        component.status = HealthStatus.ERROR
+        component.output = "connection refused"
+        return component
+
+    unhealthy.add_component(
+        component_name="db", measurement_name="ping", check_function=error_check
+    )
+    return app, [healthy, unhealthy]
+
+
+def test_that_federated_check_merges_downstream_statuses():
+    # GIVEN stub downstream services
+    app, monitors = create_stub_services()
+    transport = RecordingTransport(httpx.ASGITransport(app=app))
+
+    # GIVEN federated check polling the services
+    check = FederatedHealthCheck(
+        targets={
+            "healthy": "http://stub/healthy/health",
+            "unhealthy": "http://stub/unhealthy/health",
+        },
+        transport=transport,
+    )
+
+    async def run():
+        for monitor in monitors:
+            await monitor._manager._update_checks()
+        first = await check(ComponentHealth(component_name="mesh"))
+        second = await check(ComponentHealth(component_name="mesh"))
+        await check.aclose()
+        return first, second
+
+    # WHEN polling the services twice
+    first, second = asyncio.run(run())
+
+    # THEN expect component error due to unhealthy service
+    assert first.status == HealthStatus.ERROR
+    assert first.output == "Unhealthy targets: unhealthy"
+
+    # THEN expect nested statuses of services and their checks
+    assert first.observed_value["healthy"]["status"] == "ok"
+    assert first.observed_value["unhealthy"]["status"] == "error"
+    assert first.observed_value["unhealthy"]["checks"]["db:ping"] == {
+        "status": "error",
+        "output": "connection refused",
+    }
+    assert first.observed_value["healthy"]["checks"]["uptime"] == {"status": "ok"}
+
+    # THEN expect unchanged services to answer not modified on the second poll
+    assert sorted(transport.status_codes) == [200, 304, 304, 503]
+    assert second.observed_value == first.observed_value
+
+
+def test_that_federated_check_reports_unreachable_targets():
+    # GIVEN transport which fails to connect
+    def refuse(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    check = FederatedHealthCheck(
+        targets=["http://unreachable/health"],
+        transport=httpx.MockTransport(refuse),
+    )
+
+    # WHEN polling the target
+    async def run():
+        result = await check(ComponentHealth(component_name="mesh"))
+        await check.aclose()
+        return result
+
+    result = asyncio.run(run())
+
+    # THEN expect component error with target output
+    assert result.status == HealthStatus.ERROR
+    assert result.observed_value["http://unreachable/health"]["status"] == "error"
+    assert "connection refused" in (
+        result.observed_value["http://unreachable/health"]["output"]
+    )
+
+
+def test_that_federated_check_times_out_slow_targets():
+    # GIVEN transport which never answers in time
+    async def hang(request):
+        await asyncio.sleep(5)
+
+    check = FederatedHealthCheck(
+        targets={"slow": "http://slow/health"},
+        timeout_seconds=0.05,
+        transport=httpx.MockTransport(hang),
+    )
+
+    # WHEN polling the target
+    async def run():
+        result = await check(ComponentHealth(component_name="mesh"))
+        await check.aclose()
+        return result
+
+    result = asyncio.run(run())
+
+    # THEN expect component error with timeout output
+    assert result.status == HealthStatus.ERROR
+    assert result.observed_value["slow"] == {
+        "status": "error",
+        "output": "Request timed out after 0.05s.",
+    }
+
+
+def test_that_federated_client_is_closed_when_component_is_removed():
+    # GIVEN startup waits for first checks
+    settings.health_check_startup_wait_seconds = 5
+
+    # GIVEN FastAPI app
+    app = FastAPI()
+
+    # GIVEN health monitor with a federated component
+    monitor = HealthMonitor(
+        root_app=app, service_id="foobar", version="1", release_id="1.0.0"
+    )
+    key = monitor.add_federated_component(
+        component_name="mesh",
+        targets=["http://127.0.0.1:9/health"],
+        target_timeout_seconds=1.0,
+        timeout_seconds=2.0,
+    )
+    check = monitor._federated_checks[key]
+
+    # GIVEN check timeout is passed on to the component
+    assert monitor._manager.get_check_runner(key).timeout_seconds == 2.0
+
+    with TestClient(app):
+        # GIVEN target was polled by the first cycle
+        assert check._client is not None
+
+        # WHEN removing the component
+        monitor.remove_component(key)
+        for future in list(monitor._closing_federated_checks):
+            future.result(timeout=5)
+
+        # THEN expect client to be closed and dropped
+        assert check._client is None
+        assert key not in monitor._federated_checks
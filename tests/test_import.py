@@ -0,0 +1,62 @@
+import sys
+import json
+import subprocess
+
+
+IMPORT_SCRIPT = """
+import json, sys
+import fastapi_health_monitor
+print(json.dumps({
+    "modules": [m for m in ("fastapi", "pydantic", "pydantic_settings") if m in sys.modules],
+}))
+"""
+
+
+def run_python(script):
+    return json.loads(
+        subprocess.run(
+            [sys.executable, "-c", script],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    )
+
+
+def test_that_package_import_is_lightweight():
+    # WHEN importing the package in a fresh interpreter
+    result = run_python(IMPORT_SCRIPT)
+
+    # THEN expect heavy dependencies not to be imported
+    assert result["modules"] == []
+
+
+def test_that_settings_are_read_on_first_use():
+    # WHEN importing the manager in a fresh interpreter
+    result = run_python(
+        """
+import json
+from fastapi_health_monitor import manager
+from fastapi_health_monitor.settings import get_settings
+before = get_settings.cache_info().currsize
+manager.HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+print(json.dumps([before, get_settings.cache_info().currsize]))
+"""
+    )
+
+    # THEN expect settings to be read when the manager is created
+    assert result == [0, 1]
+
+
+def test_that_lazy_exports_are_available():
+    # WHEN importing exports from the package
+    from fastapi_health_monitor import HealthMonitor, ComponentHealth, Instrumentation
+    from fastapi_health_monitor.settings import settings, get_settings
+
+    # THEN expect exports to be resolved
+    assert HealthMonitor.__name__ == "HealthMonitor"
+    assert ComponentHealth.__name__ == "ComponentHealth"
+    assert Instrumentation.__name__ == "Instrumentation"
+
+    # THEN expect module settings to be the shared instance
+    assert settings is get_settings()
@@ -0,0 +1,154 @@
+import time
+import asyncio
+from contextlib import contextmanager
+
+from fastapi_health_monitor import (
+    ComponentHealth,
+    HealthStatus,
+    Instrumentation,
+    CheckHook,
+)
+from fastapi_health_monitor.manager import HealthCheckManager
+from fastapi_health_monitor.checkrunner import CheckRunner
+
+
+class RecordingHook(CheckHook):
+    def __init__(self):
+        self.events = []
+        self.traces = []
+
+    def before_check(self, key):
+        self.events.append(("before_check", key))
+
+    def after_check(self, trace):
+        self.events.append(("after_check", trace.key))
+        self.traces.append(trace)
+
+    def before_cycle(self):
+        self.events.append(("before_cycle",))
+
+    def after_cycle(self, duration_seconds):
+        self.events.append(("after_cycle",))
+
+
+class RecordingSpan:
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = dict(attributes or {})
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+class RecordingTracer:
+    def __init__(self):
+        self.spans = []
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        span = RecordingSpan(name, attributes)
+        self.spans.append(span)
+        yield span
+
+
+def create_manager(instrumentation, check_function):
+    manager = HealthCheckManager(
+        service_id="foobar",
+        version="1",
+        release_id="1.0.0",
+        instrumentation=instrumentation,
+    )
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(component_name="db", measurement_name="ping"),
+            check_function=check_function,
+        )
+    )
+    return manager
+
+
+def ok_check(component):
+    component.status = HealthStatus.OK
+    return component
+
+
+def test_that_hooks_and_spans_wrap_checks_and_cycles():
+    # GIVEN instrumentation with a hook and tracer
+    hook = RecordingHook()
+    tracer = RecordingTracer()
+    manager = create_manager(Instrumentation(hooks=[hook], tracer=tracer), ok_check)
+
+    # WHEN updating checks
+    asyncio.run(manager._update_checks())
+
+    # THEN expect hooks to be called around the check and cycle
+    assert hook.events == [
+        ("before_cycle",),
+        ("before_check", "db:ping"),
+        ("after_check", "db:ping"),
+        ("after_cycle",),
+    ]
+
+    # THEN expect trace with timing and result
+    assert hook.traces[0].duration_seconds >= 0
+    assert hook.traces[0].component.status == HealthStatus.OK
+
+    # THEN expect spans with check attributes
+    assert [span.name for span in tracer.spans] == [
+        "health_check_cycle",
+        "health_check",
+    ]
+    assert tracer.spans[1].attributes["health.check.key"] == "db:ping"
+    assert tracer.spans[1].attributes["health.check.status"] == "ok"
+
+
+def test_that_hook_errors_do_not_fail_checks(caplog):
+    # GIVEN hook which raises errors
+    class BrokenHook(CheckHook):
+        def before_check(self, key):
+            raise RuntimeError("broken hook")
+
+    manager = create_manager(Instrumentation(hooks=[BrokenHook()]), ok_check)
+
+    # WHEN updating checks
+    asyncio.run(manager._update_checks())
+
+    # THEN expect check result and logged hook error
+    assert manager.checks["db:ping"].status == HealthStatus.OK
+    assert "check hook error: broken hook" in caplog.text
+
+
+def test_that_profiler_samples_slow_checks(caplog):
+    # GIVEN slow sync and async checks
+    def slow_sync_check(component):
+        time.sleep(0.1)
+        component.status = HealthStatus.OK
+        return component
+
+    async def slow_async_check(component):
+        await asyncio.sleep(0.1)
+        component.status = HealthStatus.OK
+        return component
+
+    for check_function in (slow_sync_check, slow_async_check):
+        # GIVEN instrumentation with profiling enabled
+        hook = RecordingHook()
+        manager = create_manager(
+            Instrumentation(
+                hooks=[hook],
+                profile_threshold_seconds=0.02,
+                profile_interval_seconds=0.01,
+            ),
+            check_function,
+        )
+
+        # WHEN updating checks
+        asyncio.run(manager._update_checks())
+
+        # THEN expect sampled stacks to include the check function
+        samples = hook.traces[0].samples
+        assert samples
+        assert any(check_function.__name__ in frame for frame in next(iter(samples)))
+
+    # THEN expect slow check to be logged
+    assert "slow check db:ping" in caplog.text
@@ -1,12 +1,16 @@
+import time
 import logging
 import asyncio
 from unittest.mock import AsyncMock, patch
 
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from fastapi_health_monitor import HealthMonitor
+from fastapi_health_monitor import HealthMonitor, HealthStatus, ComponentHealth
 from fastapi_health_monitor.manager import HealthCheckManager
+from fastapi_health_monitor.checkrunner import CheckRunner
+from fastapi_health_monitor.settings import settings
 
 
 def test_that_health_manager_loop_exits_when_app_terminates(caplog):
@@ -89,3 +93,442 @@ def test_that_health_manager_logs_exceptions(caplog):
 
     # THEN expect log message
     assert "manager loop error: forced error" in caplog.text
+
+
+def test_that_health_manager_runners_are_keyed():
+    # GIVEN manager instance
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    # GIVEN check runners with the same key
+    first = CheckRunner(
+        component=ComponentHealth(component_name="db", measurement_name="ping"),
+        check_function=lambda c: c,
+    )
+    second = CheckRunner(
+        component=ComponentHealth(component_name="db", measurement_name="ping"),
+        check_function=lambda c: c,
+    )
+
+    # WHEN adding both runners
+    manager.add_check_runner(first)
+    manager.add_check_runner(second)
+
+    # THEN expect second runner to replace the first
+    assert manager.runners == {"db:ping": second}
+
+    # WHEN removing the runner
+    manager.remove_check_runner("db:ping")
+
+    # THEN expect no runners
+    assert not manager.runners
+
+    # THEN expect error when removing an unknown runner
+    with pytest.raises(KeyError):
+        manager.remove_check_runner("db:ping")
+
+
+def test_that_health_manager_drops_results_of_runners_removed_during_cycle():
+    # GIVEN manager instance
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    # GIVEN check which removes another runner while the cycle is running
+    def removing_check(component):
+        manager.remove_check_runner("tenant:b")
+        component.status = HealthStatus.OK
+        return component
+
+    def ok_check(component):
+        component.status = HealthStatus.OK
+        return component
+
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(component_name="tenant", measurement_name="a"),
+            check_function=removing_check,
+        )
+    )
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(component_name="tenant", measurement_name="b"),
+            check_function=ok_check,
+        )
+    )
+
+    # WHEN updating checks
+    asyncio.run(manager._update_checks())
+
+    # THEN expect removed runner to be absent from checks
+    assert "tenant:a" in manager.checks
+    assert "tenant:b" not in manager.checks
+
+
+def test_that_health_manager_shares_inflight_checks():
+    # GIVEN manager instance
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    # GIVEN slow async check which counts executions
+    calls = []
+
+    async def slow_check(component):
+        calls.append(component.component_name)
+        await asyncio.sleep(0.05)
+        component.status = HealthStatus.OK
+        return component
+
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(component_name="db", measurement_name="ping"),
+            check_function=slow_check,
+            tags=["datastore"],
+        )
+    )
+
+    # WHEN running the check loop and forced runs at the same time
+    async def run():
+        return await asyncio.gather(
+            manager._update_checks(),
+            manager.run_check_runners(keys=["db:ping"]),
+            manager.run_check_runners(tags=["datastore"]),
+        )
+
+    _, by_key, by_tag = asyncio.run(run())
+
+    # THEN expect check to be executed once
+    assert calls == ["db"]
+
+    # THEN expect all callers to get the result
+    assert by_key["db:ping"].status == HealthStatus.OK
+    assert by_tag["db:ping"].status == HealthStatus.OK
+    assert manager.checks["db:ping"].status == HealthStatus.OK
+
+
+def test_that_health_manager_reports_stale_results():
+    # GIVEN manager instance
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    # GIVEN component check with a short max age
+    def ok_check(component):
+        component.status = HealthStatus.OK
+        return component
+
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(component_name="db", measurement_name="ping"),
+            check_function=ok_check,
+            max_age_seconds=0.05,
+        )
+    )
+
+    # GIVEN checks have been updated
+    asyncio.run(manager._update_checks())
+
+    # WHEN fetching response while result is fresh
+    response = manager.get_response()
+
+    # THEN expect ok with age and time
+    assert response.status == HealthStatus.OK
+    assert response.checks["db:ping"].status == HealthStatus.OK
+    assert response.checks["db:ping"].age_seconds < 0.05
+    assert response.checks["db:ping"].time is not None
+
+    # WHEN fetching response after max age has passed
+    time.sleep(0.1)
+    response = manager.get_response()
+
+    # THEN expect stale component and system error
+    assert response.status == HealthStatus.ERROR
+    assert response.checks["db:ping"].status == HealthStatus.UNKNOWN
+    assert response.checks["db:ping"].age_seconds >= 0.05
+    assert "stale" in response.checks["db:ping"].output
+
+    # THEN expect stored result to be unchanged
+    assert manager.checks["db:ping"].status == HealthStatus.OK
+
+
+def test_that_health_manager_damps_status_changes():
+    # GIVEN manager instance
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    # GIVEN component check which reports statuses in order
+    statuses = iter(
+        [
+            HealthStatus.OK,
+            HealthStatus.ERROR,
+            HealthStatus.OK,
+            HealthStatus.ERROR,
+            HealthStatus.ERROR,
+            HealthStatus.OK,
+        ]
+    )
+
+    def flapping_check(component):
+        component.status = next(statuses)
+        return component
+
+    # GIVEN component needs 2 failures in a row to change to error
+    runner = CheckRunner(
+        component=ComponentHealth(component_name="db", measurement_name="ping"),
+        check_function=flapping_check,
+        failure_threshold=2,
+    )
+    manager.add_check_runner(runner)
+
+    # WHEN updating checks for each status
+    async def run():
+        observed = []
+        for _ in range(6):
+            await manager._update_checks()
+            observed.append(manager.checks["db:ping"].status)
+        return observed
+
+    observed = asyncio.run(run())
+
+    # THEN expect single failures to be damped
+    assert observed == [
+        HealthStatus.OK,
+        HealthStatus.OK,
+        HealthStatus.OK,
+        HealthStatus.OK,
+        HealthStatus.ERROR,
+        HealthStatus.OK,
+    ]
+
+    # THEN expect system status to follow component
+    assert manager.status == HealthStatus.OK
+
+    # THEN expect flap counts
+    assert runner.damper.flap_count == 2
+    assert manager.checks["status_flaps"].observed_value == 2
+
+
+def test_that_health_manager_times_out_checks():
+    # GIVEN manager instance
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    # GIVEN component check which hangs
+    async def hanging_check(component):
+        await asyncio.sleep(10)
+        return component
+
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(component_name="db", measurement_name="ping"),
+            check_function=hanging_check,
+            timeout_seconds=0.01,
+        )
+    )
+
+    # WHEN updating checks
+    asyncio.run(manager._update_checks())
+
+    # THEN expect component error
+    assert manager.checks["db:ping"].status == HealthStatus.ERROR
+    assert "timed out" in manager.checks["db:ping"].output
+
+    # THEN expect concurrency limit to be reported
+    assert manager.checks["concurrency_limit"].observed_value == manager.limiter.limit
+
+
+def test_that_health_manager_skips_checks_with_failed_dependencies():
+    # GIVEN manager instance
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    # GIVEN failing database check with dependent table checks
+    calls = []
+
+    def database_check(component):
+        calls.append(component.component_name)
+        component.status = HealthStatus.ERROR
+        return component
+
+    def table_check(component):
+        calls.append(component.component_name)
+        component.status = HealthStatus.OK
+        return component
+
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(component_name="users", measurement_name="rows"),
+            check_function=table_check,
+            depends_on=["db:connection"],
+        )
+    )
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(
+                component_name="db", measurement_name="connection"
+            ),
+            check_function=database_check,
+        )
+    )
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(component_name="api", measurement_name="ping"),
+            check_function=table_check,
+        )
+    )
+
+    # WHEN updating checks
+    asyncio.run(manager._update_checks())
+
+    # THEN expect checks to run in dependency waves
+    assert manager._check_waves() == [["db:connection", "api:ping"], ["users:rows"]]
+
+    # THEN expect dependent check to be skipped with inherited failure
+    assert calls.count("users") == 0
+    assert manager.checks["users:rows"].status == HealthStatus.ERROR
+    assert manager.checks["users:rows"].output == (
+        "Skipped as dependencies failed: db:connection"
+    )
+
+
+def test_that_health_manager_rejects_dependency_cycles():
+    # GIVEN manager instance with runner depending on another
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(component_name="a", measurement_name="x"),
+            check_function=lambda c: c,
+            depends_on=["b:x"],
+        )
+    )
+
+    # WHEN adding runner which depends on the first
+    # THEN expect error
+    with pytest.raises(ValueError):
+        manager.add_check_runner(
+            CheckRunner(
+                component=ComponentHealth(component_name="b", measurement_name="x"),
+                check_function=lambda c: c,
+                depends_on=["a:x"],
+            )
+        )
+
+
+def test_that_forced_runs_do_not_count_towards_system_thresholds():
+    # GIVEN system needs 3 failed cycles in a row to change to error
+    settings.health_status_failure_threshold = 3
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    # GIVEN component which fails after the first cycle and a healthy component
+    statuses = iter([HealthStatus.OK, HealthStatus.ERROR])
+
+    def failing_check(component):
+        component.status = next(statuses)
+        return component
+
+    def ok_check(component):
+        component.status = HealthStatus.OK
+        return component
+
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(component_name="db", measurement_name="ping"),
+            check_function=failing_check,
+        )
+    )
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(component_name="api", measurement_name="ping"),
+            check_function=ok_check,
+        )
+    )
+
+    # WHEN running a healthy and a failed cycle followed by forced runs
+    async def run():
+        await manager._update_checks()
+        await manager._update_checks()
+        for _ in range(2):
+            await manager.run_check_runners(keys=["api:ping"])
+
+    asyncio.run(run())
+
+    # THEN expect system to stay ok as only one cycle failed
+    assert manager.status == HealthStatus.OK
+
+
+def test_that_health_manager_ignores_paused_dependencies():
+    # GIVEN manager instance
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    # GIVEN failing database check with a dependent table check
+    def database_check(component):
+        component.status = HealthStatus.ERROR
+        return component
+
+    def table_check(component):
+        component.status = HealthStatus.OK
+        return component
+
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(
+                component_name="db", measurement_name="connection"
+            ),
+            check_function=database_check,
+        )
+    )
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(component_name="users", measurement_name="rows"),
+            check_function=table_check,
+            depends_on=["db:connection"],
+        )
+    )
+
+    # WHEN pausing the failed database check after a cycle
+    async def run():
+        await manager._update_checks()
+        manager.pause_check_runner("db:connection")
+        await manager._update_checks()
+
+    asyncio.run(run())
+
+    # THEN expect dependent check to run and system to be ok
+    assert manager.checks["users:rows"].status == HealthStatus.OK
+    assert manager.status == HealthStatus.OK
+
+
+def test_that_health_manager_etag_is_stable_across_cycles():
+    # GIVEN manager instance
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    # GIVEN check which reports a new reading every cycle
+    def counter_check(component):
+        component.status = HealthStatus.OK
+        component.observed_value = time.monotonic()
+        return component
+
+    manager.add_check_runner(
+        CheckRunner(
+            component=ComponentHealth(component_name="queue", measurement_name="depth"),
+            check_function=counter_check,
+        )
+    )
+
+    # WHEN running two cycles
+    async def run():
+        await manager._update_checks()
+        first = manager.get_response()
+        await asyncio.sleep(0.01)
+        await manager._update_checks()
+        return first, manager.get_response()
+
+    first, second = asyncio.run(run())
+
+    # THEN expect readings to change
+    assert first.checks["queue:depth"].observed_value != (
+        second.checks["queue:depth"].observed_value
+    )
+    assert first.checks["queue:depth"].time != second.checks["queue:depth"].time
+
+    # THEN expect same ETag
+    assert first.etag() == second.etag()
+
+    # WHEN the check status changes
+    manager.checks["queue:depth"] = manager.checks["queue:depth"].model_copy(
+        update={"status": HealthStatus.ERROR}
+    )
+
+    # THEN expect new ETag
+    assert manager.get_response().etag() != first.etag()
@@ -62,3 +62,37 @@ def test_that_health_monitor_has_system_checks():
 
     # THEN expect observed value to be float
     assert isinstance(res.json()["checks"]["uptime"]["observed_value"], float)
+
+
+def test_that_health_monitor_returns_not_modified_for_matching_etag():
+    # GIVEN FastAPI app
+    app = FastAPI(debug=True)
+
+    # GIVEN health monitor instance
+    HealthMonitor(
+        root_app=app,
+        service_id="foobar",
+        version="1",
+        release_id="1.0.0",
+    )
+
+    with TestClient(app) as client:
+        # WHEN fetching health status
+        res = client.get("/health")
+
+        # THEN expect ETag
+        etag = res.headers["ETag"]
+        assert etag.startswith('W/"')
+
+        # WHEN fetching health status with the ETag
+        res = client.get("/health", headers={"If-None-Match": etag})
+
+        # THEN expect not modified
+        assert res.status_code == 304
+        assert res.headers["ETag"] == etag
+
+        # WHEN fetching health status with another ETag
+        res = client.get("/health", headers={"If-None-Match": 'W/"other"'})
+
+        # THEN expect full response
+        assert res.status_code == 200
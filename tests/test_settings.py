@@ -0,0 +1,182 @@
+import os
+import signal
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fastapi_health_monitor import HealthMonitor
+from fastapi_health_monitor.manager import HealthCheckManager
+from fastapi_health_monitor.settings import settings
+
+
+def test_that_reconfigure_applies_new_delay_to_waiting_loop():
+    # GIVEN manager instance with a long delay
+    settings.health_check_delay_seconds = 60
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    async def run():
+        cycles = []
+        original = manager._update_checks
+
+        async def counted_update():
+            cycles.append(1)
+            await original()
+
+        manager._update_checks = counted_update
+        await manager.start()
+
+        # WHEN reducing the delay while the loop is waiting
+        await asyncio.sleep(0.05)
+        manager.reconfigure(health_check_delay_seconds=0)
+        await asyncio.sleep(0.05)
+        manager.stop()
+        return len(cycles)
+
+    # THEN expect loop to run again without waiting out the old delay
+    assert asyncio.run(run()) > 1
+    assert settings.health_check_delay_seconds == 0
+
+
+def test_that_reconfigure_validates_settings():
+    # GIVEN manager instance
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    # WHEN reconfiguring an unknown setting
+    # THEN expect error
+    with pytest.raises(ValueError):
+        manager.reconfigure(health_check_unknown=1)
+
+    # WHEN reconfiguring with an invalid value
+    # THEN expect error and unchanged settings
+    delay = settings.health_check_delay_seconds
+    with pytest.raises(ValueError):
+        manager.reconfigure(health_check_delay_seconds="soon")
+    assert settings.health_check_delay_seconds == delay
+
+    # WHEN reconfiguring concurrency limits
+    manager.reconfigure(health_check_concurrency_max=2)
+
+    # THEN expect limiter to be updated
+    assert manager.limiter.max_limit == 2
+    assert manager.limiter.limit == 2
+
+
+def test_that_settings_reload_from_env_file_on_sighup(tmp_path, monkeypatch):
+    # GIVEN .env file in the working directory
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".env").write_text("HEALTH_CHECK_TIMEOUT_SECONDS=3\n")
+
+    # GIVEN existing SIGHUP handler
+    def previous_handler(signum, frame):
+        pass
+
+    signal.signal(signal.SIGHUP, previous_handler)
+
+    # GIVEN settings are reloaded on SIGHUP
+    settings.health_settings_reload_on_sighup = True
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    async def run():
+        await manager.start()
+
+        # WHEN the process receives SIGHUP
+        os.kill(os.getpid(), signal.SIGHUP)
+        await asyncio.sleep(0.05)
+        manager.stop()
+
+    asyncio.run(run())
+
+    # THEN expect settings from the .env file
+    assert settings.health_check_timeout_seconds == 3
+
+    # THEN expect existing SIGHUP handler to be restored on stop
+    assert signal.getsignal(signal.SIGHUP) is previous_handler
+
+
+def test_that_settings_reload_when_env_file_changes(tmp_path, monkeypatch):
+    # GIVEN .env file in the working directory which is watched
+    monkeypatch.chdir(tmp_path)
+    env_file = tmp_path / ".env"
+    env_file.write_text("HEALTH_CHECK_TIMEOUT_SECONDS=3\n")
+    settings.health_settings_watch_seconds = 0.01
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    async def run():
+        await manager.start()
+
+        # WHEN the .env file changes
+        await asyncio.sleep(0.05)
+        env_file.write_text(
+            "HEALTH_CHECK_TIMEOUT_SECONDS=7\nHEALTH_SETTINGS_WATCH_SECONDS=0.01\n"
+        )
+        os.utime(env_file, ns=(0, 1))
+        await asyncio.sleep(0.05)
+        manager.stop()
+
+    asyncio.run(run())
+
+    # THEN expect settings from the changed .env file
+    assert settings.health_check_timeout_seconds == 7
+
+
+def test_that_env_file_watcher_stops_when_disabled():
+    # GIVEN manager instance which watches the .env file
+    settings.health_settings_watch_seconds = 0.01
+    manager = HealthCheckManager(service_id="foobar", version="1", release_id="1.0.0")
+
+    async def run():
+        await manager.start()
+
+        # WHEN disabling the watcher
+        manager.reconfigure(health_settings_watch_seconds=None)
+        await asyncio.sleep(0.05)
+        stopped = manager._watch_task.done()
+        manager.stop()
+        return stopped
+
+    # THEN expect watcher to stop
+    assert asyncio.run(run())
+
+
+def test_that_admin_endpoint_updates_settings():
+    # GIVEN FastAPI app
+    app = FastAPI(debug=True)
+
+    # GIVEN health monitor instance with admin endpoint
+    HealthMonitor(
+        root_app=app,
+        service_id="foobar",
+        version="1",
+        release_id="1.0.0",
+        admin_endpoint="/admin",
+        admin_token="secret",
+    )
+    headers = {"Authorization": "Bearer secret"}
+
+    with TestClient(app) as client:
+        # WHEN updating the check delay
+        res = client.patch(
+            "/admin/settings",
+            json={"health_check_delay_seconds": 30},
+            headers=headers,
+        )
+
+        # THEN expect updated settings
+        assert res.status_code == 200
+        assert res.json()["health_check_delay_seconds"] == 30
+        assert (
+            client.get("/admin/settings", headers=headers).json()[
+                "health_check_delay_seconds"
+            ]
+            == 30
+        )
+
+        # WHEN updating an unknown setting
+        res = client.patch(
+            "/admin/settings", json={"health_check_unknown": 1}, headers=headers
+        )
+
+        # THEN expect unprocessable
+        assert res.status_code == 422